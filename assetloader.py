@@ -0,0 +1,93 @@
+# assetloader.py
+
+"""
+Loads images and sounds on a small thread pool so the first screen can be
+drawn before every asset is decoded.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+
+class AssetLoader:
+    """
+    Runs asset loading functions in the background, in the order they were
+    requested. take() hands over each result once it is ready, so the game
+    can keep drawing placeholders until then.
+
+    It also measures startup: timeToFirstFrame is the time from creation
+    to the first drawn frame, and timeToAllAssets the time until every
+    requested asset was ready (both in seconds, None until then). They
+    are written under lock by the pool threads, so read them with
+    timings().
+    """
+    def __init__(self, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix='assets')
+        self.futures = {}   # Key -> Future, until taken
+        self.running = 0    # Requests not finished yet
+        self.lock = threading.Lock()
+        self.startTime = time.perf_counter()
+        self.timeToFirstFrame = None
+        self.timeToAllAssets = None
+
+    def request(self, key, function, *args):
+        """
+        Starts function(*args) in the background; take() hands over its
+        result under key.
+        """
+        with self.lock:
+            self.running += 1
+        future = self.executor.submit(function, *args)
+        self.futures[key] = future
+        future.add_done_callback(self.finished)
+
+    def finished(self, future):
+        # Runs on the thread that finished the request. Stamped each time
+        # nothing is running, so the last stamp is when the last one ended.
+        with self.lock:
+            self.running -= 1
+            if self.running == 0:
+                self.timeToAllAssets = time.perf_counter() - self.startTime
+
+    def take(self):
+        """
+        Returns {key: result} for the assets that finished since the last
+        call. An asset whose loading failed is reported and skipped.
+        """
+        ready = {}
+        for key, future in list(self.futures.items()):
+            if future.done():
+                del self.futures[key]
+                try:
+                    ready[key] = future.result()
+                except Exception as error:
+                    print(f"Error: could not load {key}: {error}")
+        if not self.futures:
+            self.executor.shutdown(wait=False)
+        return ready
+
+    def pending(self):
+        return len(self.futures)
+
+    def frameDrawn(self):
+        with self.lock:
+            if self.timeToFirstFrame is None:
+                self.timeToFirstFrame = time.perf_counter() - self.startTime
+
+    def timings(self):
+        """
+        Returns (timeToFirstFrame, timeToAllAssets). The second is None
+        while a request's done callback has not run yet, even if take()
+        already handed over its result.
+        """
+        with self.lock:
+            allAssets = self.timeToAllAssets if self.running == 0 else None
+            return self.timeToFirstFrame, allAssets
+
+    def report(self):
+        def seconds(value):
+            return '-' if value is None else f"{value * 1000:.0f} ms"
+        firstFrame, allAssets = self.timings()
+        return f"first frame {seconds(firstFrame)}, all assets {seconds(allAssets)}"
@@ -0,0 +1,11 @@
+# benchmarks/__init__.py
+
+"""
+Benchmarks for the game. Run them from the repository root, for example:
+
+    python -m benchmarks.memory
+
+benchmarks.suite runs the seeded scenarios and compares them with the
+baseline made on this machine (benchmarks/baseline.json, created with
+--updateBaseline).
+"""
@@ -0,0 +1,83 @@
+# benchmarks/generation.py
+
+"""
+Reports level build times per level number: how long Game.reset takes
+(what a level transition with the N key costs), the slowest single chunk
+load while the camera scrolls through the level, and the time to generate
+every chunk of the level. The last column is the reset time when the
+level comes from the on-disk level cache instead of the generator.
+
+    python -m benchmarks.generation [--maxLevel 15] [--difficulty Hard]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from headless import createHeadlessGame
+from levelcache import levelCachePath, writeLevelFile
+
+FRAME_BUDGET_MS = 1000 / 30
+
+
+def timeLevel(game, level):
+    """
+    Returns (reset ms, worst chunk load ms, whole level ms) for a level.
+    """
+    start = time.perf_counter()
+    game.reset(level=level, resetScore=True)
+    resetMs = (time.perf_counter() - start) * 1000
+
+    # Scroll the camera across the level the way play would
+    worstChunkMs = 0
+    totalMs = resetMs
+    while game.cameraX < game.worldWidth - game.width:
+        game.cameraX = min(game.cameraX + game.chunkWidth / 4,
+                           game.worldWidth - game.width)
+        start = time.perf_counter()
+        game.streamChunks()
+        elapsed = (time.perf_counter() - start) * 1000
+        worstChunkMs = max(worstChunkMs, elapsed)
+        totalMs += elapsed
+    return resetMs, worstChunkMs, totalMs
+
+
+def timeCachedReset(game, level, cacheDir):
+    """
+    Returns the reset ms for a level whose cache file is already written.
+    """
+    for levelToCache in (level, level + 1):
+        key = (game.seed, levelToCache, game.difficulty, game.width, game.height)
+        path = levelCachePath(cacheDir, *key)
+        if not os.path.exists(path):
+            writeLevelFile(path, *key)
+    game.levelCacheDir = cacheDir
+    start = time.perf_counter()
+    game.reset(level=level, resetScore=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    game.levelCacheDir = None
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Level generation times.')
+    parser.add_argument('--maxLevel', type=int, default=15)
+    parser.add_argument('--difficulty', choices=['Easy', 'Hard'], default='Hard')
+    args = parser.parse_args()
+
+    game = createHeadlessGame(difficulty=args.difficulty, seed=0,
+                              useLevelCache=False)
+    print(f"{'Level':>5} {'Reset ms':>9} {'Worst chunk ms':>15} {'Whole level ms':>15} "
+          f"{'Cached reset ms':>16}")
+    with tempfile.TemporaryDirectory() as cacheDir:
+        for level in range(1, args.maxLevel + 1):
+            resetMs, worstChunkMs, totalMs = timeLevel(game, level)
+            cachedMs = timeCachedReset(game, level, cacheDir)
+            flag = '  over frame budget' if max(resetMs, worstChunkMs) > FRAME_BUDGET_MS else ''
+            print(f"{level:>5} {resetMs:>9.2f} {worstChunkMs:>15.2f} {totalMs:>15.1f} "
+                  f"{cachedMs:>16.2f}{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/memory.py
+
+"""
+Reports how much memory each kind of entity takes and the total footprint
+of a freshly started level (the chunks loaded around the camera), for
+levels 1-15.
+
+    python -m benchmarks.memory [--maxLevel 15] [--difficulty Hard]
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+from headless import createHeadlessGame
+from entities2 import (Hero, Walker, Chaser, Cloud, Platform, Hole, PowerUp,
+                       Collectible)
+
+
+def entitySize(entity):
+    """
+    Bytes used by an entity instance, including its __dict__ if it has one.
+    Shared values (colors, images) are not counted.
+    """
+    size = sys.getsizeof(entity)
+    if hasattr(entity, '__dict__'):
+        size += sys.getsizeof(entity.__dict__)
+    return size
+
+
+def sampleEntities(game):
+    """
+    Returns one instance of each entity type.
+    """
+    return {
+        'Hero': Hero(0, 0),
+        'Walker': Walker(0, 0, game),
+        'Chaser': Chaser(0, 0, game),
+        'Cloud': Cloud(0, 0),
+        'Platform': Platform(0, 0, 100, 20),
+        'Hole': Hole(0, 100),
+        'PowerUp': PowerUp(0, 0, 'magnet'),
+        'Collectible': Collectible(0, 0),
+    }
+
+
+def levelFootprint(level, difficulty):
+    """
+    Generates a level and returns (bytes allocated, entity counts).
+    """
+    tracemalloc.start()
+    game = createHeadlessGame(level=level, difficulty=difficulty, seed=level,
+                              useLevelCache=False)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    counts = {
+        'platforms': len(game.platforms),
+        'holes': len(game.holes),
+        'collectibles': len(game.collectibles),
+        'powerUps': len(game.powerUps),
+        'clouds': len(game.clouds),
+    }
+    return allocated, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Entity and level memory use.')
+    parser.add_argument('--maxLevel', type=int, default=15)
+    parser.add_argument('--difficulty', choices=['Easy', 'Hard'], default='Hard')
+    args = parser.parse_args()
+
+    game = createHeadlessGame(seed=0, useLevelCache=False)
+    print("Bytes per entity")
+    for name, entity in sampleEntities(game).items():
+        print(f"  {name:<12} {entitySize(entity):6d}")
+
+    print()
+    print(f"{'Level':>5} {'Total KiB':>10} {'Platforms':>10} {'Holes':>6} "
+          f"{'Fish':>7} {'PowerUps':>9} {'Clouds':>7}")
+    for level in range(1, args.maxLevel + 1):
+        allocated, counts = levelFootprint(level, args.difficulty)
+        print(f"{level:>5} {allocated / 1024:>10.1f} {counts['platforms']:>10} "
+              f"{counts['holes']:>6} {counts['collectibles']:>7} "
+              f"{counts['powerUps']:>9} {counts['clouds']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+# benchmarks/suite.py
+
+"""
+Scripted, seeded benchmark scenarios for the simulation and rendering:
+
+    generation   reset and whole-level generation time for levels 1, 5, 10
+    simulation   steps/sec with 10, 100 and 500 enemies on screen (and with
+                 500 enemies in the NumPy entity store, if installed)
+    magnet       steps/sec and pickup phase time while the magnet pulls in
+                 a field of fish
+    render       redrawAll time and shapes drawn per frame, drawn into the
+                 recording draw backend with the sprite atlas and glyph
+                 images the game uses (when cmu_graphics and PIL are
+                 installed)
+
+Each scenario runs once to warm up, then several times, and reports the
+median. Results are written as JSON and compared against a baseline
+stored on this machine; timings from another machine say nothing about a
+change, so the baseline is not checked in. --updateBaseline creates it
+(or replaces it after an intended change). Metrics that got worse by more than the tolerance are reported
+as regressions and make the run exit with status 1. Timings (metrics in
+ms) that changed by less than --floorMs are never regressions:
+sub-millisecond times are mostly noise.
+
+    python -m benchmarks.suite [--output results.json]
+                               [--baseline benchmarks/baseline.json]
+                               [--tolerance 0.3] [--floorMs 1.0]
+                               [--only generation,render] [--updateBaseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Imported before headless so the render scenario gets the real image
+# classes, and with them the sprite atlas and glyph images
+from graphics import RecordingBackend, setDrawBackend
+
+from headless import createHeadlessGame, populateEnemies, runHeadless
+from benchmarks.generation import timeLevel
+from entities2 import Collectible, createSpriteAtlas
+from sprites import SpriteAtlas
+
+SEED = 2024
+REPEATS = 5
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'baseline.json')
+
+
+def newGame(level=1, difficulty='Hard'):
+    return createHeadlessGame(level=level, difficulty=difficulty, seed=SEED,
+                              useLevelCache=False)
+
+
+def generation(level):
+    game = newGame()
+    resetMs, worstChunkMs, wholeLevelMs = timeLevel(game, level)
+    return {'resetMs': resetMs, 'worstChunkMs': worstChunkMs,
+            'wholeLevelMs': wholeLevelMs}
+
+
+def crowdedGame(enemies, useStore=False):
+    """
+    A game whose hero stands shielded at the start, so enemies are not
+    cleared by lost lives and the screen stays full.
+    """
+    game = newGame()
+    if useStore and not game.enableEntityStore():
+        return None
+    game.hero.activateShield(game, duration=10 ** 9)
+    populateEnemies(game, enemies)
+    return game
+
+
+def simulation(enemies, useStore=False, steps=600, batch=30):
+    """
+    Steps the game with the screen kept topped up to the enemy count.
+    """
+    game = crowdedGame(enemies, useStore)
+    if game is None:
+        return None
+    elapsed = 0.0
+    for _ in range(steps // batch):
+        populateEnemies(game, max(0, enemies - game.enemyCount()))
+        elapsed += batch / runHeadless(game, batch, keys=())
+    return {'stepsPerSecond': steps / elapsed}
+
+
+def magnet(fish=600, steps=600):
+    """
+    Stands still with the magnet on while a field of fish is pulled in.
+    """
+    game = newGame()
+    hero = game.hero
+    for i in range(fish):
+        # Rows of fish around the hero, mostly inside the magnet's range
+        collectible = Collectible(hero.x - 300 + (i % 30) * 20,
+                                  hero.y - 150 + (i // 30) * 15)
+        game.collectibles.append(collectible)
+        game.broadPhase.insert(collectible)
+    hero.activateMagnet(game, duration=steps * 2 / game.stepsPerSecond)
+    game.scheduler.resetTimes()
+    stepsPerSecond = runHeadless(game, steps, keys=(), restart=False)
+    return {'stepsPerSecond': stepsPerSecond,
+            'pickupsMs': game.scheduler.averageTimes()['pickups']}
+
+
+def render(enemies=100, frames=600):
+    game = crowdedGame(enemies)
+    if SpriteAtlas.available():
+        game.spriteAtlas = createSpriteAtlas()
+    recorder = RecordingBackend()
+    previous = setDrawBackend(recorder)
+    times = []
+    drawCalls = 0
+    try:
+        for _ in range(frames):
+            populateEnemies(game, max(0, enemies - game.enemyCount()))
+            runHeadless(game, 1, keys=())
+            start = time.perf_counter()
+            frame = recorder.captureFrame(game.redrawAll)
+            times.append((time.perf_counter() - start) * 1000)
+            drawCalls += len(frame)
+    finally:
+        setDrawBackend(previous)
+    return {'frameMs': statistics.median(times),
+            'drawCallsPerFrame': drawCalls / frames}
+
+
+SCENARIOS = {
+    'generation.level1': lambda: generation(1),
+    'generation.level5': lambda: generation(5),
+    'generation.level10': lambda: generation(10),
+    'simulation.enemies10': lambda: simulation(10),
+    'simulation.enemies100': lambda: simulation(100),
+    'simulation.enemies500': lambda: simulation(500),
+    'simulation.store500': lambda: simulation(500, useStore=True),
+    'magnet.fish600': magnet,
+    'render.enemies100': render,
+}
+
+
+def runScenario(scenario):
+    """
+    Runs a scenario REPEATS times, after one warm-up run, and returns the
+    median of each metric.
+    """
+    scenario()  # Warm up caches and the CPU clock; not counted
+    runs = [scenario() for _ in range(REPEATS)]
+    if runs[0] is None:
+        return None  # Not available here (e.g. NumPy missing)
+    return {metric: statistics.median(run[metric] for run in runs)
+            for metric in runs[0]}
+
+
+def higherIsBetter(metric):
+    return metric.endswith('PerSecond')
+
+
+def isTiming(metric):
+    return metric.endswith('Ms')
+
+
+def compare(results, baseline, tolerance, floorMs=1.0):
+    """
+    Prints each metric against the baseline. Returns the regressions.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old:
+                print(f"{name:<24} {metric:<18} {value:12.3f}  (no baseline)")
+                continue
+            change = (value - old) / old
+            worse = -change if higherIsBetter(metric) else change
+            regressed = worse > tolerance
+            if isTiming(metric) and abs(value - old) < floorMs:
+                regressed = False  # Within timer noise
+            flag = '  REGRESSION' if regressed else ''
+            print(f"{name:<24} {metric:<18} {value:12.3f} {old:12.3f} "
+                  f"{change:+8.1%}{flag}")
+            if flag:
+                regressions.append((name, metric))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suite.')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='allowed relative slowdown before a regression')
+    parser.add_argument('--floorMs', type=float, default=1.0,
+                        help='smallest change in a timing that can be a regression')
+    parser.add_argument('--updateBaseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--only', default='',
+                        help='comma-separated scenarios or groups '
+                             '(e.g. generation or generation.level1)')
+    args = parser.parse_args()
+
+    selected = [part for part in args.only.split(',') if part]
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        if selected and not any(name == part or name.startswith(part + '.')
+                                for part in selected):
+            continue
+        result = runScenario(scenario)
+        if result is not None:
+            results[name] = result
+
+    report = {'seed': SEED, 'repeats': REPEATS,
+              'host': platform.node(),
+              'python': platform.python_version(),
+              'machine': platform.machine(),
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        if stored.get('host') != report['host']:
+            print(f"Warning: the baseline was made on {stored.get('host')!r}, "
+                  f"not on this machine; timings are not comparable")
+    elif not args.updateBaseline:
+        print(f"No baseline at {args.baseline}; run with --updateBaseline "
+              f"to create one on this machine")
+    regressions = compare(results, baseline, args.tolerance, args.floorMs)
+
+    if args.updateBaseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
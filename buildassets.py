@@ -0,0 +1,91 @@
+# buildassets.py
+
+"""
+Offline build step for the game's images:
+
+    python buildassets.py [--width 800] [--height 600] [--colors 256]
+
+Every image the game loads (see game2.imageAssets) is resized to the size
+it is drawn at and reduced to a palette of at most --colors colors, then
+saved as an optimized PNG in assetcache/ with a manifest. Environment.openImage
+loads these instead of the originals, skipping the resize at startup. An
+entry is ignored once its source image changes, until the next build.
+"""
+
+import os
+
+# Must be set before the game modules import graphics
+os.environ.setdefault('CAT_HEADLESS', '1')
+
+import argparse
+import json
+from PIL import Image as PILImage
+from environment import ASSET_CACHE_DIR, ASSET_MANIFEST, sourceStamp
+from game2 import imageAssets
+
+
+def builtFileName(fileName, size):
+    stem = os.path.splitext(os.path.basename(fileName))[0]
+    return f"{stem}-{size[0]}x{size[1]}.png"
+
+
+def reduceColors(image, colors):
+    """
+    Returns image with at most the given number of colors. Transparent
+    images keep their alpha channel in the palette.
+    """
+    if image.mode == 'RGBA':
+        return image.quantize(colors, method=PILImage.Quantize.FASTOCTREE)
+    return image.convert('RGB').quantize(colors, method=PILImage.Quantize.MEDIANCUT)
+
+
+def buildImage(fileName, size, colors, cacheDir=ASSET_CACHE_DIR):
+    """
+    Writes the built version of one image and returns its manifest entry.
+    The full-color image is kept if the palette does not make it smaller.
+    """
+    image = PILImage.open(fileName)
+    image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    if image.size != size:
+        image = image.resize(size, PILImage.LANCZOS)
+    path = os.path.join(cacheDir, builtFileName(fileName, size))
+    image.save(path, optimize=True)
+    fullColorBytes = os.path.getsize(path)
+    if colors:
+        reduceColors(image, colors).save(path, optimize=True)
+        if os.path.getsize(path) >= fullColorBytes:
+            image.save(path, optimize=True)
+    return {'source': fileName, 'size': list(size),
+            'file': os.path.basename(path), 'stamp': sourceStamp(fileName),
+            'bytes': os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-scale and compress the game images.')
+    parser.add_argument('--width', type=int, default=800)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--colors', type=int, default=256,
+                        help='palette size (0 keeps full color)')
+    args = parser.parse_args()
+
+    os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+    entries = []
+    totalBefore = totalAfter = 0
+    for fileName, size in imageAssets(args.width, args.height):
+        entry = buildImage(fileName, tuple(size), args.colors)
+        entries.append(entry)
+        before = os.path.getsize(fileName)
+        totalBefore += before
+        totalAfter += entry['bytes']
+        print(f"{fileName:24} {size[0]:4}x{size[1]:<4} "
+              f"{before / 1024:7.1f} KB -> {entry['bytes'] / 1024:7.1f} KB")
+    print(f"{'total':34} {totalBefore / 1024:7.1f} KB -> {totalAfter / 1024:7.1f} KB")
+
+    with open(os.path.join(ASSET_CACHE_DIR, ASSET_MANIFEST), 'w') as file:
+        json.dump({'images': entries}, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# chunks.py
+
+"""
+Fixed-width slices of a level, generated as the camera approaches them.
+"""
+
+
+class LevelChunk:
+    """
+    The level content whose generation starts inside one fixed-width slice
+    of the world. Items keep the order they were generated in, so the n-th
+    fish of a chunk is the same fish every time the chunk is generated.
+    """
+    __slots__ = ('index', 'platforms', 'holes', 'collectibles', 'powerUps',
+                 'clouds')
+
+    def __init__(self, index):
+        self.index = index
+        self.platforms = []
+        self.holes = []
+        self.collectibles = []
+        self.powerUps = []
+        self.clouds = []
+
+    def collectedOrdinals(self):
+        """
+        Returns the positions of the collected fish and power-ups, so they
+        stay collected if the chunk is generated again.
+        """
+        return ([i for i, c in enumerate(self.collectibles) if c.collected],
+                [i for i, p in enumerate(self.powerUps) if p.collected])
+
+    def markCollected(self, ordinals):
+        fishOrdinals, powerUpOrdinals = ordinals
+        for i in fishOrdinals:
+            self.collectibles[i].collected = True
+        for i in powerUpOrdinals:
+            self.powerUps[i].collected = True
@@ -0,0 +1,54 @@
+# enemypool.py
+
+"""
+Recycles enemy objects instead of creating a new one for every spawn.
+"""
+
+
+class EnemyPool:
+    """
+    Keeps a free list of removed enemies for each enemy class. acquire
+    reuses a free enemy, resetting its position, lifetime and animation,
+    and only creates a new one when the list is empty. release returns an
+    enemy that was stomped, culled or expired. At most maxFree enemies of
+    each class are kept.
+    """
+    def __init__(self, maxFree=50):
+        self.maxFree = maxFree
+        self.free = {}      # Enemy class -> removed enemies
+        self.active = 0     # Enemies handed out and not yet released
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, enemyClass, x, y, app, images=None):
+        """
+        Returns an enemyClass enemy standing at (x, y), as enemyClass(...)
+        would.
+        """
+        free = self.free.get(enemyClass)
+        if free:
+            enemy = free.pop()
+            enemy.reset(x, y, app, images=images)
+            self.reused += 1
+        else:
+            enemy = enemyClass(x, y, app, images=images)
+            self.created += 1
+        self.active += 1
+        return enemy
+
+    def release(self, enemy):
+        self.active -= 1
+        free = self.free.setdefault(type(enemy), [])
+        if len(free) < self.maxFree:
+            free.append(enemy)
+
+    def freeCount(self):
+        return sum(len(free) for free in self.free.values())
+
+    def occupancy(self):
+        """
+        Returns the pool's counters: enemies in use, waiting in the free
+        lists, ever created and reused.
+        """
+        return {'active': self.active, 'free': self.freeCount(),
+                'created': self.created, 'reused': self.reused}
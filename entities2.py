@@ -1,22 +1,35 @@
 # entities.py
 
-from cmu_graphics import *
+from graphics import *
 import math
 import random
 from environment import Environment  # Import the Environment class
+from sprites import drawShapes, SpriteAtlas
+
+# Physics in pixels and seconds; positions advance by velocity * app.dt
+GRAVITY = 900          # Downward acceleration (px/s^2)
+HERO_SPEED = 180       # Walking speed (px/s)
+JUMP_VELOCITY = -450   # Initial jump velocity (px/s)
+ENEMY_SPEED = 60       # Dog walking and chasing speed (px/s)
+MAGNET_SPEED = 300     # Speed of fish pulled by the magnet (px/s)
+MAGNET_RANGE = 250     # Distance the magnet pulls fish from (px)
+PLATFORM_SPEED = 60    # Moving platform speed (px/s)
+POWER_UP_SECONDS = 10  # Duration of the magnet and shield
 
 class Sprite:
     """
     Base class for all moving objects in the game.
     Handles basic physics and collision detection.
     """
+    __slots__ = ('radius', 'x', 'y', 'dx', 'dy', 'gravity', 'color', 'onGround')
+
     def __init__(self, x, y, color="black"):
         self.radius = 25  # Radius for collision detection
         self.x = x  # Horizontal position
         self.y = y - self.radius  # Vertical position
-        self.dx = 0  # Horizontal velocity
-        self.dy = 0  # Vertical velocity
-        self.gravity = 1  # Gravity acceleration
+        self.dx = 0  # Horizontal velocity (px/s)
+        self.dy = 0  # Vertical velocity (px/s)
+        self.gravity = GRAVITY  # Gravity acceleration (px/s^2)
         self.color = color  # Color for drawing
         self.onGround = False  # Whether the sprite is on the ground
 
@@ -26,44 +39,41 @@ class Sprite:
 
     def onStep(self, app):
         """
-        Updates the sprite's position and handles collisions.
+        Updates the sprite's position by one step of app.dt seconds and
+        handles collisions.
         """
+        dt = app.dt
         # Apply gravity to vertical velocity
-        self.dy += self.gravity
+        self.dy += self.gravity * dt
         # Update position based on velocities
-        self.x += self.dx
-        self.y += self.dy
-
-        # Check for collision with the ground
-        if self.y + self.radius >= app.groundHeight:
-            # Check if the sprite is over a hole
-            overHole = False
-            for hole in app.holes:
-                if hole.x <= self.x <= hole.x + hole.width:
-                    overHole = True
-                    break
-            if not overHole:
-                self.y = app.groundHeight - self.radius
-                self.dy = 0
-                self.onGround = True
-            else:
-                self.onGround = False
+        self.x += self.dx * dt
+        stepY = self.dy * dt
+        self.y += stepY
+
+        # Check for collision with the ground (None when over a hole)
+        groundY = app.terrain.groundAt(self.x)
+        if groundY is not None and self.y + self.radius >= groundY:
+            self.y = groundY - self.radius
+            self.dy = 0
+            self.onGround = True
         else:
             self.onGround = False
 
         # Check for collision with platforms from above and below
-        for platform in app.platforms:
+        # (only the few platforms under this sprite's x-span)
+        for platform in app.platformIndex.query(self.x - self.radius,
+                                                self.x + self.radius):
             if (self.x + self.radius > platform.x and
                 self.x - self.radius < platform.x + platform.width):
                 if (self.y + self.radius >= platform.y and
-                    self.y + self.radius - self.dy <= platform.y and
+                    self.y + self.radius - stepY <= platform.y and
                     self.dy >= 0):
                     # Collision from above
                     self.y = platform.y - self.radius
                     self.dy = 0
                     self.onGround = True
                 elif (self.y - self.radius <= platform.y + platform.height and
-                      self.y - self.radius - self.dy >= platform.y + platform.height and
+                      self.y - self.radius - stepY >= platform.y + platform.height and
                       self.dy < 0):
                     # Collision from below
                     self.y = platform.y + platform.height + self.radius
@@ -91,22 +101,27 @@ class Hero(Sprite):
     """
     Represents the player's character.
     """
+    __slots__ = ('speed', 'jumpStrength', 'lives', 'score', 'images',
+                 'currentImageIndex', 'secondsPerImage', 'stepsSinceLastImage',
+                 'doubleJumpCount', 'magnetActive', 'shieldActive',
+                 'shieldTimer', 'magnetTimer', 'powerUpTimers')
+
     def __init__(self, x, y, images=None):
         super().__init__(x, y, color="gray")
-        self.speed = 6  # Movement speed
-        self.jumpStrength = -15  # Jump velocity
+        self.speed = HERO_SPEED  # Movement speed (px/s)
+        self.jumpStrength = JUMP_VELOCITY  # Jump velocity (px/s)
         self.lives = 3  # Number of lives
         self.score = 0  # Player's score
         self.images = images  # List of images for animation
         self.currentImageIndex = 0  # For animation frames
-        self.stepsPerImage = 5  # Controls animation speed
+        self.secondsPerImage = 1 / 6  # Controls animation speed
         self.stepsSinceLastImage = 0  # Counts steps for animation
         # Power-up attributes
         self.doubleJumpCount = 0  # Number of double jumps available
         self.magnetActive = False
         self.shieldActive = False
-        self.shieldTimer = 0  # Timer for shield duration (in frames)
-        self.magnetTimer = 0  # Timer for magnet duration (in frames)
+        self.shieldTimer = 0  # Timer for shield duration (in steps)
+        self.magnetTimer = 0  # Timer for magnet duration (in steps)
         self.powerUpTimers = {}  # Dictionary to hold power-up timers
 
     def draw(self, app):
@@ -118,117 +133,113 @@ class Hero(Sprite):
             currentImage = self.images[self.currentImageIndex]
             drawImage(currentImage, x - self.radius, y - self.radius,
                       width=self.radius*2, height=self.radius*2)
+        elif app.spriteAtlas is not None:
+            # One pre-rendered image instead of ~25 shapes
+            app.spriteAtlas.draw('heroShield' if self.shieldActive else 'hero', x, y)
         else:
-            # Draw the head (face)
-            drawCircle(x, y, self.radius,
-                       fill="lightGray", border="darkGray", borderWidth=2)
-
-            # Draw the ears
-            earSize = self.radius / 2
-            # Left ear coordinates
-            leftEar = [
-                (x - self.radius / 2, y - self.radius / 1.5),
-                (x - self.radius / 1.2, y - self.radius * 1.2),
-                (x - self.radius / 5, y - self.radius / 1.2)
-            ]
-            # Flatten the list of tuples into a list of coordinates
-            leftEarCoords = [coord for point in leftEar for coord in point]
-            # Draw left ear
-            drawPolygon(*leftEarCoords, fill="lightGray",
-                        border="darkGray", borderWidth=2)
-            # Inner left ear coordinates
-            innerLeftEar = [
-                (x - self.radius / 2 + 4, y - self.radius / 1.5 + 4),
-                (x - self.radius / 1.2 + 4, y - self.radius * 1.2 + 8),
-                (x - self.radius / 5 - 2, y - self.radius / 1.2 + 4)
-            ]
-            innerLeftEarCoords = [coord for point in innerLeftEar\
-                                  for coord in point]
-            # Draw inner left ear
-            drawPolygon(*innerLeftEarCoords, fill="pink")
-
-            # Right ear coordinates
-            rightEar = [
-                (x + self.radius / 2, y - self.radius / 1.5),
-                (x + self.radius / 1.2, y - self.radius * 1.2),
-                (x + self.radius / 5, y - self.radius / 1.2)
-            ]
-            rightEarCoords = [coord for point in rightEar for coord in point]
-            # Draw right ear
-            drawPolygon(*rightEarCoords, fill="lightGray",
-                        border="darkGray", borderWidth=2)
-            # Inner right ear coordinates
-            innerRightEar = [
-                (x + self.radius / 2 - 4, y - self.radius / 1.5 + 4),
-                (x + self.radius / 1.2 - 4, y - self.radius * 1.2 + 8),
-                (x + self.radius / 5 + 2, y - self.radius / 1.2 + 4)
-            ]
-            innerRightEarCoords = [coord for point in innerRightEar\
-                                   for coord in point]
-            # Draw inner right ear
-            drawPolygon(*innerRightEarCoords, fill="pink")
-
-            # Draw the eyes
-            eyeOffsetX = self.radius / 3
-            eyeOffsetY = self.radius / 4
-            eyeRadius = self.radius / 4
-            # Left eye
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius,
-                       fill="white")
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-            # Right eye
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius,
-                       fill="white")
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-
-            # Draw the nose
-            noseY = y
-            noseSize = self.radius / 6
-            drawCircle(x, noseY, noseSize, fill="pink", border="black")
-
-            # Draw the mouth
-            mouthWidth = self.radius / 2
-            mouthHeight = self.radius / 6
-            drawArc(x, y + self.radius / 4,
-                    mouthWidth, mouthHeight,
-                    200, 140, border="black")
-
-            # Draw whiskers
-            whiskerLength = self.radius
-            whiskerY = noseY + self.radius / 8
-            # Left whiskers
-            drawLine(x - noseSize, whiskerY, x - whiskerLength, whiskerY - 5,
-                     lineWidth=1, fill="black")
-            drawLine(x - noseSize, whiskerY + 2.5, x - whiskerLength, whiskerY + 4,
-                     lineWidth=1, fill="black")
-            drawLine(x - noseSize, whiskerY + 5, x - whiskerLength, whiskerY + 10,
-                     lineWidth=1, fill="black")
-            # Right whiskers
-            drawLine(x + noseSize, whiskerY, x + whiskerLength, whiskerY - 5,
-                     lineWidth=1, fill="black")
-            drawLine(x + noseSize, whiskerY + 2.5, x + whiskerLength, whiskerY + 4,
-                     lineWidth=1, fill="black")
-            drawLine(x + noseSize, whiskerY + 5, x + whiskerLength, whiskerY + 10,
-                     lineWidth=1, fill="black")
-
-            # Draw shield if active
-            if self.shieldActive:
-                drawCircle(x, y, self.radius + 5, fill=None,
-                           border="blue", borderWidth=3)
-
-    def updateAnimation(self):
+            drawShapes(self.vectorShapes(x, y))
+
+    def vectorShapes(self, x, y):
+        """
+        Returns the shapes of the drawn cat centered at (x, y), as
+        (kind, args, kwargs) tuples for drawShapes.
+        """
+        shapes = []
+        # Draw the head (face)
+        shapes.append(('Circle', (x, y, self.radius),
+                       dict(fill="lightGray", border="darkGray", borderWidth=2)))
+
+        # Draw the ears
+        # Left ear coordinates
+        leftEar = [
+            (x - self.radius / 2, y - self.radius / 1.5),
+            (x - self.radius / 1.2, y - self.radius * 1.2),
+            (x - self.radius / 5, y - self.radius / 1.2)
+        ]
+        # Flatten the list of tuples into a list of coordinates
+        leftEarCoords = [coord for point in leftEar for coord in point]
+        shapes.append(('Polygon', leftEarCoords,
+                       dict(fill="lightGray", border="darkGray", borderWidth=2)))
+        # Inner left ear coordinates
+        innerLeftEar = [
+            (x - self.radius / 2 + 4, y - self.radius / 1.5 + 4),
+            (x - self.radius / 1.2 + 4, y - self.radius * 1.2 + 8),
+            (x - self.radius / 5 - 2, y - self.radius / 1.2 + 4)
+        ]
+        innerLeftEarCoords = [coord for point in innerLeftEar\
+                              for coord in point]
+        shapes.append(('Polygon', innerLeftEarCoords, dict(fill="pink")))
+
+        # Right ear coordinates
+        rightEar = [
+            (x + self.radius / 2, y - self.radius / 1.5),
+            (x + self.radius / 1.2, y - self.radius * 1.2),
+            (x + self.radius / 5, y - self.radius / 1.2)
+        ]
+        rightEarCoords = [coord for point in rightEar for coord in point]
+        shapes.append(('Polygon', rightEarCoords,
+                       dict(fill="lightGray", border="darkGray", borderWidth=2)))
+        # Inner right ear coordinates
+        innerRightEar = [
+            (x + self.radius / 2 - 4, y - self.radius / 1.5 + 4),
+            (x + self.radius / 1.2 - 4, y - self.radius * 1.2 + 8),
+            (x + self.radius / 5 + 2, y - self.radius / 1.2 + 4)
+        ]
+        innerRightEarCoords = [coord for point in innerRightEar\
+                               for coord in point]
+        shapes.append(('Polygon', innerRightEarCoords, dict(fill="pink")))
+
+        # Draw the eyes
+        eyeOffsetX = self.radius / 3
+        eyeOffsetY = self.radius / 4
+        eyeRadius = self.radius / 4
+        for eyeX in (x - eyeOffsetX, x + eyeOffsetX):
+            shapes.append(('Circle', (eyeX, y - eyeOffsetY, eyeRadius),
+                           dict(fill="white")))
+            shapes.append(('Circle', (eyeX, y - eyeOffsetY, eyeRadius / 2),
+                           dict(fill="black")))
+
+        # Draw the nose
+        noseY = y
+        noseSize = self.radius / 6
+        shapes.append(('Circle', (x, noseY, noseSize),
+                       dict(fill="pink", border="black")))
+
+        # Draw the mouth
+        mouthWidth = self.radius / 2
+        mouthHeight = self.radius / 6
+        shapes.append(('Arc', (x, y + self.radius / 4, mouthWidth, mouthHeight,
+                               200, 140), dict(border="black")))
+
+        # Draw whiskers, three on each side
+        whiskerLength = self.radius
+        whiskerY = noseY + self.radius / 8
+        for side in (-1, 1):
+            for startDy, endDy in ((0, -5), (2.5, 4), (5, 10)):
+                shapes.append(('Line', (x + side * noseSize, whiskerY + startDy,
+                                        x + side * whiskerLength, whiskerY + endDy),
+                               dict(lineWidth=1, fill="black")))
+
+        # Draw shield if active
+        if self.shieldActive:
+            shapes.append(('Circle', (x, y, self.radius + 5),
+                           dict(fill=None, border="blue", borderWidth=3)))
+        return shapes
+
+    def updateAnimation(self, app):
         """
         Updates the hero's animation frame based on movement.
         """
+        stepsPerImage = self.secondsPerImage * app.stepsPerSecond
         if self.images:
             self.stepsSinceLastImage += 1
-            if self.stepsSinceLastImage >= self.stepsPerImage:
+            if self.stepsSinceLastImage >= stepsPerImage:
                 self.currentImageIndex = (self.currentImageIndex + 1) % len(self.images)
                 self.stepsSinceLastImage = 0
         else:
             if self.dx != 0 or not self.onGround:
                 self.stepsSinceLastImage += 1
-                if self.stepsSinceLastImage >= self.stepsPerImage:
+                if self.stepsSinceLastImage >= stepsPerImage:
                     # Toggle between 2 frames for walking animation
                     self.currentImageIndex = (self.currentImageIndex + 1) % 2
                     self.stepsSinceLastImage = 0
@@ -240,7 +251,7 @@ class Hero(Sprite):
         # Update position and check collisions
         super().onStep(app)
         # Update animation frame
-        self.updateAnimation()
+        self.updateAnimation(app)
         # Handle shield duration
         if self.shieldActive:
             self.shieldTimer -= 1
@@ -262,31 +273,44 @@ class Hero(Sprite):
         """
         self.doubleJumpCount += 1
 
-    def activateMagnet(self, app, duration=300):
+    def activateMagnet(self, app, duration=POWER_UP_SECONDS):
         """
-        Activates magnet ability.
+        Activates magnet ability for duration seconds.
         """
         self.magnetActive = True
-        self.magnetTimer = duration
-        self.powerUpTimers['Magnet'] = duration // app.stepsPerSecond
+        self.magnetTimer = duration * app.stepsPerSecond
+        self.powerUpTimers['Magnet'] = self.magnetTimer // app.stepsPerSecond
 
-    def activateShield(self, app, duration=300):
+    def activateShield(self, app, duration=POWER_UP_SECONDS):
         """
-        Activates shield ability.
+        Activates shield ability for duration seconds.
         """
         self.shieldActive = True
-        self.shieldTimer = duration
-        self.powerUpTimers['Shield'] = duration // app.stepsPerSecond
+        self.shieldTimer = duration * app.stepsPerSecond
+        self.powerUpTimers['Shield'] = self.shieldTimer // app.stepsPerSecond
 
 
 class Enemy(Sprite):
     """
     Base class for enemy sprites.
     """
+    __slots__ = ('lifeTimer',)
+
     def __init__(self, x, y, app, color="brown"):
         super().__init__(x, y, color)
-        self.dx = -2  # Moves left by default
-        # Enemy lifetime in frames (random between 10s and 25s)
+        Enemy.reset(self, x, y, app)
+
+    def reset(self, x, y, app):
+        """
+        Puts the enemy at (x, y) with a new lifetime, as if just created.
+        Used to recycle enemies (see EnemyPool).
+        """
+        self.x = x
+        self.y = y - self.radius
+        self.dx = -ENEMY_SPEED  # Moves left by default
+        self.dy = 0
+        self.onGround = False
+        # Enemy lifetime in steps (random between 25s and 35s)
         self.lifeTimer = random.randint(25 * app.stepsPerSecond,
                                         35 * app.stepsPerSecond)
 
@@ -294,16 +318,71 @@ class Enemy(Sprite):
         # Placeholder for drawing; to be overridden by subclasses
         pass
 
+    def dogShapes(self, x, y, headColor):
+        """
+        Returns the shapes of a drawn dog centered at (x, y), as
+        (kind, args, kwargs) tuples for drawShapes.
+        """
+        # Draw the dog's head
+        shapes = [('Circle', (x, y, self.radius),
+                   dict(fill=headColor, border="black", borderWidth=2))]
+
+        # Draw the floppy ears
+        earWidth = self.radius / 1.5
+        earHeight = self.radius 
+        earOffsetX = self.radius / 1.5
+        earOffsetY = self.radius / 1.5  # Increased to position ears higher
+        for side in (-1, 1):
+            shapes.append(('Oval', (x + side * earOffsetX,
+                                    y - earOffsetY + self.radius / 10,
+                                    earWidth, earHeight),
+                           dict(fill="peru", border="black", borderWidth=1,
+                                rotateAngle=-45 * side)))
+
+        # Draw the eyes
+        eyeOffsetX = self.radius / 4
+        eyeOffsetY = self.radius / 4
+        eyeRadius = self.radius / 5
+        for eyeX in (x - eyeOffsetX, x + eyeOffsetX):
+            shapes.append(('Circle', (eyeX, y - eyeOffsetY, eyeRadius),
+                           dict(fill="white")))
+            shapes.append(('Circle', (eyeX, y - eyeOffsetY, eyeRadius / 2),
+                           dict(fill="black")))
+
+        # Draw the nose
+        noseY = y + self.radius / 6
+        noseSize = self.radius / 6
+        shapes.append(('Oval', (x, noseY, noseSize, noseSize / 2),
+                       dict(fill="black")))
+
+        # Draw the mouth
+        mouthWidth = self.radius / 2
+        mouthHeight = self.radius / 8
+        shapes.append(('Arc', (x, y + self.radius / 2, mouthWidth, mouthHeight,
+                               200, 140), dict(border="black")))
+        return shapes
+
     def onStep(self, app):
+        """
+        Runs a full update: decides the movement, then applies it.
+        """
+        self.think(app)
+        self.integrate(app)
+
+    def think(self, app):
+        """
+        Decides how the enemy moves this step; overridden by subclasses.
+        """
+        pass
+
+    def integrate(self, app):
         """
         Updates the enemy's position and handles lifetime.
         """
         # Decrease life timer
         self.lifeTimer -= 1
         if self.lifeTimer <= 0:
-            # Remove enemy from the game when time is up
-            if self in app.enemies:
-                app.enemies.remove(self)
+            # Time is up; the game removes the enemy in its cull phase
             return  # Skip further updates for this enemy
         # Apply gravity and movement
         super().onStep(app)
@@ -313,13 +392,22 @@ class Walker(Enemy):
     """
     Enemy that walks horizontally and reverses direction at boundaries.
     """
+    __slots__ = ('images', 'currentImageIndex', 'secondsPerImage',
+                 'stepsSinceLastImage')
+
     def __init__(self, x, y, app, color="sienna", images=None):
         super().__init__(x, y, app, color)
         self.images = images  # List of images for animation
         self.currentImageIndex = 0  # For animation frames
-        self.stepsPerImage = 8  # Controls animation speed
+        self.secondsPerImage = 8 / 30  # Controls animation speed
         self.stepsSinceLastImage = 0  # Counts steps for animation
 
+    def reset(self, x, y, app, images=None):
+        super().reset(x, y, app)
+        self.images = images
+        self.currentImageIndex = 0
+        self.stepsSinceLastImage = 0
+
     def draw(self, app):
         x = self.x - app.cameraX
         y = self.y
@@ -329,65 +417,28 @@ class Walker(Enemy):
             currentImage = self.images[self.currentImageIndex]
             drawImage(currentImage, x - self.radius, y - self.radius,
                       width=self.radius*2, height=self.radius*2)
-        else :
-
-            # Draw the dog's head
-            drawCircle(x, y, self.radius, fill="sienna",
-                       border="black", borderWidth=2)
-
-            # Draw the floppy ears
-            earWidth = self.radius / 1.5
-            earHeight = self.radius 
-            earOffsetX = self.radius / 1.5
-            earOffsetY = self.radius / 1.5  # Increased to position ears higher
-
-            # Left ear
-            drawOval(x - earOffsetX, y - earOffsetY + self.radius / 10,  
-                     earWidth, earHeight,fill="peru", border="black",
-                     borderWidth=1, rotateAngle=45)
-        
-            # Right ear
-            drawOval(x + earOffsetX, y - earOffsetY + self.radius / 10,  
-                     earWidth, earHeight, fill="peru", border="black",
-                     borderWidth=1, rotateAngle=-45)
-
-            # Draw the eyes
-            eyeOffsetX = self.radius / 4
-            eyeOffsetY = self.radius / 4
-            eyeRadius = self.radius / 5
-            # Left eye
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius, fill="white")
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-            # Right eye
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius, fill="white")
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-
-            # Draw the nose
-            noseY = y + self.radius / 6
-            noseSize = self.radius / 6
-            drawOval(x, noseY, noseSize, noseSize / 2, fill="black")
-
-            # Draw the mouth
-            mouthWidth = self.radius / 2
-            mouthHeight = self.radius / 8
-            drawArc(x, y + self.radius / 2,
-                    mouthWidth, mouthHeight,
-                    200, 140, border="black")
+        elif app.spriteAtlas is not None:
+            app.spriteAtlas.draw('walker', x, y)
+        else:
+            drawShapes(self.vectorShapes(x, y))
 
+    def vectorShapes(self, x, y):
+        return self.dogShapes(x, y, headColor="sienna")
     
-    def updateAnimation(self):
+    def updateAnimation(self, app):
         """
         Updates the hero's animation frame based on movement.
         """
+        stepsPerImage = self.secondsPerImage * app.stepsPerSecond
         if self.images:
             self.stepsSinceLastImage += 1
-            if self.stepsSinceLastImage >= self.stepsPerImage:
+            if self.stepsSinceLastImage >= stepsPerImage:
                 self.currentImageIndex = (self.currentImageIndex + 1) % len(self.images)
                 self.stepsSinceLastImage = 0
         else:
             if self.dx != 0 or not self.onGround:
                 self.stepsSinceLastImage += 1
-                if self.stepsSinceLastImage >= self.stepsPerImage:
+                if self.stepsSinceLastImage >= stepsPerImage:
                     # Toggle between 2 frames for walking animation
                     self.currentImageIndex = (self.currentImageIndex + 1) % 2
                     self.stepsSinceLastImage = 0
@@ -395,9 +446,9 @@ class Walker(Enemy):
                 # Reset to standing frame when not moving
                 self.currentImageIndex = 0
 
-    def onStep(self, app):
+    def think(self, app):
         # Move horizontally
-        self.x += self.dx
+        self.x += self.dx * app.dt
 
         # Reverse direction upon reaching world boundaries or holes
         if (self.x - self.radius <= 0 or
@@ -405,35 +456,42 @@ class Walker(Enemy):
             self.checkForHole(app)):
             self.dx *= -1
 
+    def integrate(self, app):
         # Update position and handle lifetime
-        super().onStep(app)
-        self.updateAnimation()
+        super().integrate(app)
+        self.updateAnimation(app)
 
     def checkForHole(self, app):
         """
         Checks if the enemy is about to walk into a hole.
         """
-        nextX = self.x + self.dx
-        for hole in app.holes:
-            if (hole.x <= nextX <= hole.x + hole.width and
-                self.y + self.radius >= app.groundHeight - 1):
-                return True
-        return False
+        nextX = self.x + self.dx * app.dt
+        return (self.y + self.radius >= app.groundHeight - 1 and
+                not app.terrain.isOverGround(nextX))
 
 
 class Chaser(Enemy):
     """
     Enemy that chases the hero when in range.
     """
+    __slots__ = ('speed', 'chaseRange', 'images', 'currentImageIndex',
+                 'secondsPerImage', 'stepsSinceLastImage')
+
     def __init__(self, x, y, app, color="darkred", images=None):
         super().__init__(x, y, app, color)
-        self.speed = 2
+        self.speed = ENEMY_SPEED
         self.chaseRange = 300  # Distance at which the enemy starts chasing
         self.images = images  # List of images for animation
         self.currentImageIndex = 0  # For animation frames
-        self.stepsPerImage = 8  # Controls animation speed
+        self.secondsPerImage = 8 / 30  # Controls animation speed
         self.stepsSinceLastImage = 0  # Counts steps for animation
 
+    def reset(self, x, y, app, images=None):
+        super().reset(x, y, app)
+        self.images = images
+        self.currentImageIndex = 0
+        self.stepsSinceLastImage = 0
+
     def draw(self, app):
         x = self.x - app.cameraX  # Adjust for camera offset
         y = self.y
@@ -442,63 +500,29 @@ class Chaser(Enemy):
             currentImage = self.images[self.currentImageIndex]
             drawImage(currentImage, x - self.radius, y - self.radius,
                       width=self.radius*4, height=self.radius*4)
-        else : 
-        # Draw the enemy as a wolf
-            drawCircle(x, y, self.radius, fill="peru",
-                       border="black", borderWidth=2)
-
-            # Draw the floppy ears
-            earWidth = self.radius / 1.5
-            earHeight = self.radius 
-            earOffsetX = self.radius / 1.5
-            earOffsetY = self.radius / 1.5  # Increased to position ears higher
-
-            # Left ear
-            drawOval(x - earOffsetX, y - earOffsetY + self.radius / 10,  
-                     earWidth, earHeight,fill="peru", border="black",
-                     borderWidth=1, rotateAngle=45)
-        
-            # Right ear
-            drawOval(x + earOffsetX, y - earOffsetY + self.radius / 10,  
-                     earWidth, earHeight, fill="peru", border="black",
-                     borderWidth=1, rotateAngle=-45)
-
-            # Draw the eyes
-            eyeOffsetX = self.radius / 4
-            eyeOffsetY = self.radius / 4
-            eyeRadius = self.radius / 5
-            # Left eye
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius, fill="white")
-            drawCircle(x - eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-            # Right eye
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius, fill="white")
-            drawCircle(x + eyeOffsetX, y - eyeOffsetY, eyeRadius / 2, fill="black")
-
-            # Draw the nose
-            noseY = y + self.radius / 6
-            noseSize = self.radius / 6
-            drawOval(x, noseY, noseSize, noseSize / 2, fill="black")
-
-            # Draw the mouth
-            mouthWidth = self.radius / 2
-            mouthHeight = self.radius / 8
-            drawArc(x, y + self.radius / 2,
-                    mouthWidth, mouthHeight,
-                    200, 140, border="black")
-            
-    def updateAnimation(self):
+        elif app.spriteAtlas is not None:
+            app.spriteAtlas.draw('chaser', x, y)
+        else:
+            # Draw the enemy as a wolf
+            drawShapes(self.vectorShapes(x, y))
+
+    def vectorShapes(self, x, y):
+        return self.dogShapes(x, y, headColor="peru")
+
+    def updateAnimation(self, app):
         """
         Updates the hero's animation frame based on movement.
         """
+        stepsPerImage = self.secondsPerImage * app.stepsPerSecond
         if self.images:
             self.stepsSinceLastImage += 1
-            if self.stepsSinceLastImage >= self.stepsPerImage:
+            if self.stepsSinceLastImage >= stepsPerImage:
                 self.currentImageIndex = (self.currentImageIndex + 1) % len(self.images)
                 self.stepsSinceLastImage = 0
         else:
             if self.dx != 0 or not self.onGround:
                 self.stepsSinceLastImage += 1
-                if self.stepsSinceLastImage >= self.stepsPerImage:
+                if self.stepsSinceLastImage >= stepsPerImage:
                     # Toggle between 2 frames for walking animation
                     self.currentImageIndex = (self.currentImageIndex + 1) % 2
                     self.stepsSinceLastImage = 0
@@ -506,7 +530,7 @@ class Chaser(Enemy):
                 # Reset to standing frame when not moving
                 self.currentImageIndex = 0
                 
-    def onStep(self, app):
+    def think(self, app):
         # Check distance to hero
         distance = math.hypot(self.x - app.hero.x, self.y - app.hero.y)
         if distance <= self.chaseRange:
@@ -518,16 +542,19 @@ class Chaser(Enemy):
         else:
             self.dx = 0  # Stop moving if out of range
 
-        self.x += self.dx
+        self.x += self.dx * app.dt
 
+    def integrate(self, app):
         # Update position and handle lifetime
-        super().onStep(app)
-        self.updateAnimation()
+        super().integrate(app)
+        self.updateAnimation(app)
 
 class Cloud:
     """
     Represents a cloud in the background.
     """
+    __slots__ = ('x', 'y', 'size', 'color')
+
     def __init__(self, x, y, size=50, color="white"):
         self.x = x  # Horizontal position
         self.y = y  # Vertical position
@@ -562,6 +589,9 @@ class Platform:
     """
     Represents a platform that the hero can stand on.
     """
+    __slots__ = ('x', 'y', 'width', 'height', 'color', 'moving',
+                 'direction', 'range', 'startX')
+
     def __init__(self, x, y, width, height, color="brown", moving=False):
         self.x = x  # Horizontal position
         self.y = y  # Vertical position
@@ -585,7 +615,7 @@ class Platform:
         Updates the platform's position if it is moving.
         """
         if self.moving:
-            self.x += self.direction * 2  # Speed of movement
+            self.x += self.direction * PLATFORM_SPEED * app.dt
             if abs(self.x - self.startX) >= self.range:
                 self.direction *= -1  # Reverse direction
 
@@ -594,6 +624,8 @@ class Hole:
     """
     Represents a hole in the ground.
     """
+    __slots__ = ('x', 'width')
+
     def __init__(self, x, width):
         self.x = x  # Horizontal position
         self.width = width  # Width of the hole
@@ -612,6 +644,8 @@ class PowerUp:
     """
     Represents a power-up item.
     """
+    __slots__ = ('radius', 'x', 'y', 'collected', 'powerType')
+
     def __init__(self, x, y, powerType):
         self.radius = 15
         self.x = x
@@ -657,6 +691,8 @@ class Collectible:
     """
     Represents a collectible item (fish) that the hero can collect.
     """
+    __slots__ = ('radius', 'x', 'y', 'collected', 'color')
+
     def __init__(self, x, y, color="orange"):
         self.radius = 10  # Size of the collectible
         self.x = x  # Horizontal position
@@ -691,14 +727,35 @@ class Collectible:
         distanceSq = dx * dx + dy * dy
         return distanceSq <= (self.radius + hero.radius) ** 2
 
-    def moveTowardsHero(self, hero):
+    def moveTowardsHero(self, hero, dt):
         """
-        Moves the collectible towards the hero if magnet is active.
+        Moves the collectible towards the hero if magnet is active and it
+        is in range. Callers only pass the collectibles near the hero (see
+        Game.updateCollectibles).
         """
         if hero.magnetActive:
             dx = hero.x - self.x
             dy = hero.y - self.y
             distance = math.hypot(dx, dy)
-            if distance < 250:  # Attraction range
-                self.x += dx / distance * 10  # Speed towards hero
-                self.y += dy / distance * 10
\ No newline at end of file
+            # Attraction range; a fish right on the hero has no direction
+            if 0 < distance < MAGNET_RANGE:
+                step = MAGNET_SPEED * dt  # Distance moved this step
+                self.x += dx / distance * step
+                self.y += dy / distance * step
+
+
+def createSpriteAtlas():
+    """
+    Renders the drawn hero (with and without its shield) and the drawn
+    dogs once, so they can be drawn as images.
+    """
+    atlas = SpriteAtlas()
+    hero = Hero(0, 0)
+    atlas.add('hero', hero.vectorShapes(0, 0))
+    hero.shieldActive = True
+    atlas.add('heroShield', hero.vectorShapes(0, 0))
+    for name, enemyClass in (('walker', Walker), ('chaser', Chaser)):
+        enemy = enemyClass.__new__(enemyClass)
+        enemy.radius = hero.radius
+        atlas.add(name, enemy.vectorShapes(0, 0))
+    return atlas
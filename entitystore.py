@@ -0,0 +1,251 @@
+# entitystore.py
+
+"""
+Array-backed storage for large numbers of enemies.
+
+Instead of one Walker/Chaser object per dog, EnemyStore keeps positions,
+velocities, radii, timers and flags in NumPy arrays and runs AI, gravity,
+movement, ground/platform resolution, lifetime expiry and hero-distance
+checks as batch operations over all enemies at once. It reproduces the
+per-object behaviour of Walker and Chaser step for step.
+
+NumPy is optional; EnemyStore.available() reports whether it can be used.
+"""
+
+from entities2 import Walker, Chaser, GRAVITY, ENEMY_SPEED
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WALKER = 0
+CHASER = 1
+
+
+class EnemyStore:
+    """
+    Struct-of-arrays store for Walker and Chaser enemies.
+    """
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.allocate(capacity)
+        self.terrain = None
+        # Draw-only stand-ins, filled from the arrays for each visible enemy
+        self.drawProxies = {WALKER: Walker.__new__(Walker),
+                            CHASER: Chaser.__new__(Chaser)}
+
+    def available():
+        return np is not None
+
+    def allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.lifeTimer = np.zeros(capacity, dtype=np.int64)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.onGround = np.zeros(capacity, dtype=bool)
+        self.currentImageIndex = np.zeros(capacity, dtype=np.int64)
+        self.stepsSinceLastImage = np.zeros(capacity, dtype=np.int64)
+
+    def grow(self):
+        """
+        Doubles the capacity of every array, keeping the live enemies.
+        """
+        old = {name: getattr(self, name)[:self.count] for name in self.fields()}
+        self.allocate(self.capacity * 2)
+        for name, values in old.items():
+            getattr(self, name)[:self.count] = values
+
+    def fields(self):
+        return ('x', 'y', 'dx', 'dy', 'radius', 'lifeTimer', 'kind',
+                'onGround', 'currentImageIndex', 'stepsSinceLastImage')
+
+    def spawn(self, x, y, kind, lifeTimer, radius=25):
+        """
+        Adds an enemy. x and y have the same meaning as for Walker/Chaser.
+        """
+        if self.count == self.capacity:
+            self.grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y - radius
+        self.dx[i] = -ENEMY_SPEED
+        self.dy[i] = 0
+        self.radius[i] = radius
+        self.lifeTimer[i] = lifeTimer
+        self.kind[i] = kind
+        self.onGround[i] = False
+        self.currentImageIndex[i] = 0
+        self.stepsSinceLastImage[i] = 0
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def keep(self, mask):
+        """
+        Compacts the arrays down to the enemies where mask is True.
+        """
+        kept = int(mask.sum())
+        if kept == self.count:
+            return
+        for name in self.fields():
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def groundAt(self, app, xs):
+        """
+        Vectorized TerrainProfile.groundAt: ground height under each x,
+        NaN over holes.
+        """
+        if self.terrain is not app.terrain:
+            # Level changed; convert the new profile to arrays once
+            self.terrain = app.terrain
+            self.spanStarts = np.array(app.terrain.starts, dtype=float)
+            self.spanHeights = np.array([np.nan if h is None else h
+                                         for h in app.terrain.heights])
+        i = np.searchsorted(self.spanStarts, xs, side='right') - 1
+        # Hole edges belong to the hole
+        onHoleEdge = ((i > 0) & (xs == self.spanStarts[i]) &
+                      np.isnan(self.spanHeights[i - 1]) &
+                      ~np.isnan(self.spanHeights[i]))
+        i[onHoleEdge] -= 1
+        return self.spanHeights[i]
+
+    def think(self, app):
+        """
+        Batched Walker.think and Chaser.think.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y, dx, r = self.x[:n], self.y[:n], self.dx[:n], self.radius[:n]
+        walkers = self.kind[:n] == WALKER
+
+        # Chasers head for the hero when it is within range
+        chaseRange = 300
+        distance = np.hypot(x - app.hero.x, y - app.hero.y)
+        chaseDx = np.where(x < app.hero.x, float(ENEMY_SPEED), float(-ENEMY_SPEED))
+        chaseDx[distance > chaseRange] = 0
+        dx[~walkers] = chaseDx[~walkers]
+
+        x += dx * app.dt
+
+        # Walkers turn around at the world edges and before holes
+        nearGround = y + r >= app.groundHeight - 1
+        holeAhead = nearGround & np.isnan(self.groundAt(app, x + dx * app.dt))
+        turn = walkers & ((x - r <= 0) | (x + r >= app.worldWidth) | holeAhead)
+        dx[turn] *= -1
+
+    def integrate(self, app, gravity=GRAVITY, secondsPerImage=8 / 30,
+                  imageCounts=(0, 0)):
+        """
+        Batched Enemy.integrate: lifetime, gravity, movement, ground and
+        platform collisions, then animation.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y, dx, dy = self.x[:n], self.y[:n], self.dx[:n], self.dy[:n]
+        r, onGround = self.radius[:n], self.onGround[:n]
+
+        self.lifeTimer[:n] -= 1
+        alive = self.lifeTimer[:n] > 0
+
+        # Apply gravity and update position (expired enemies stay put)
+        dt = app.dt
+        dy[alive] += gravity * dt
+        x[alive] += dx[alive] * dt
+        stepY = dy * dt
+        y[alive] += stepY[alive]
+
+        # Collision with the ground, unless over a hole
+        groundY = self.groundAt(app, x)
+        landed = alive & ~np.isnan(groundY) & (y + r >= groundY)
+        y[landed] = groundY[landed] - r[landed]
+        dy[landed] = 0
+        onGround[alive] = landed[alive]
+
+        # Collision with platforms, one platform at a time in index order so
+        # the result matches Sprite.onStep
+        if alive.any():
+            left = float((x - r)[alive].min())
+            right = float((x + r)[alive].max())
+            for platform in app.platformIndex.query(left, right):
+                over = (alive & (x + r > platform.x) &
+                        (x - r < platform.x + platform.width))
+                bottom = platform.y + platform.height
+                fromAbove = (over & (y + r >= platform.y) &
+                             (y + r - stepY <= platform.y) & (dy >= 0))
+                fromBelow = (over & ~fromAbove & (y - r <= bottom) &
+                             (y - r - stepY >= bottom) & (dy < 0))
+                y[fromAbove] = platform.y - r[fromAbove]
+                onGround[fromAbove] = True
+                y[fromBelow] = bottom + r[fromBelow]
+                dy[fromAbove | fromBelow] = 0
+
+        self.updateAnimation(secondsPerImage * app.stepsPerSecond, imageCounts)
+
+    def updateAnimation(self, stepsPerImage, imageCounts):
+        """
+        Batched Walker/Chaser.updateAnimation. imageCounts gives the number
+        of images for (walkers, chasers); 0 means the vector drawing.
+        """
+        n = self.count
+        index, steps = self.currentImageIndex[:n], self.stepsSinceLastImage[:n]
+        frames = np.where(self.kind[:n] == WALKER, imageCounts[WALKER],
+                          imageCounts[CHASER])
+        hasImages = frames > 0
+        moving = hasImages | (self.dx[:n] != 0) | ~self.onGround[:n]
+        steps[moving] += 1
+        advance = moving & (steps >= stepsPerImage)
+        index[advance] = (index[advance] + 1) % np.where(hasImages, frames, 2)[advance]
+        steps[advance] = 0
+        index[~moving] = 0
+
+    def touching(self, hero):
+        """
+        Returns the indices of the live enemies overlapping the hero.
+        """
+        n = self.count
+        distanceSq = (self.x[:n] - hero.x) ** 2 + (self.y[:n] - hero.y) ** 2
+        hits = ((distanceSq <= (self.radius[:n] + hero.radius) ** 2) &
+                (self.lifeTimer[:n] > 0))
+        return np.flatnonzero(hits)
+
+    def remove(self, indices):
+        mask = np.ones(self.count, dtype=bool)
+        mask[indices] = False
+        self.keep(mask)
+
+    def cull(self, cameraX):
+        """
+        Removes expired enemies and those off-screen to the left.
+        """
+        n = self.count
+        self.keep((self.lifeTimer[:n] > 0) &
+                  (self.x[:n] + self.radius[:n] >= cameraX - 100))
+
+    def draw(self, app, images):
+        """
+        Draws the enemies in the viewport through the Walker/Chaser draw
+        code. images maps WALKER/CHASER to their image lists.
+        """
+        n = self.count
+        # Chaser images extend 3 radii to the right of x
+        visible = np.flatnonzero((self.x[:n] + self.radius[:n] * 3 >= app.cameraX) &
+                                 (self.x[:n] - self.radius[:n] <= app.cameraX + app.width))
+        for i in visible:
+            kind = int(self.kind[i])
+            proxy = self.drawProxies[kind]
+            proxy.x = float(self.x[i])
+            proxy.y = float(self.y[i])
+            proxy.radius = float(self.radius[i])
+            proxy.images = images[kind]
+            proxy.currentImageIndex = int(self.currentImageIndex[i])
+            proxy.draw(app)
@@ -1,23 +1,164 @@
 # environment.py
 
-from cmu_graphics import *
-from PIL import Image as PILImage
+from graphics import *
+from collections import OrderedDict
+import json
+import os
+import threading
+from sprites import SpriteAtlas, drawShapes, rasterizeShapes, translateShapes
 import math
 
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    # Only needed for loading images; headless runs never do
+    PILImage = None
+
+class AssetCache:
+    """
+    Bounded cache of loaded assets, keyed by whatever identifies a variant
+    (for images, the file name and size). The least recently used entry is
+    dropped when the cache is full. Safe to use from the asset loader's
+    threads.
+    """
+    def __init__(self, maxEntries=32):
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the cached asset for key, or None.
+        """
+        with self.lock:
+            asset = self.entries.get(key)
+            if asset is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return asset
+
+    def put(self, key, asset):
+        with self.lock:
+            self.entries[key] = asset
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits,
+                'misses': self.misses}
+
+
+# Decoded images for the whole process, so returning to the menu reuses them
+imageCache = AssetCache()
+# Hearts, fish and power-up icons, by (shape, size, color)
+glyphCache = AssetCache(maxEntries=64)
+
+# Pre-scaled, palette-reduced images written by buildassets.py
+ASSET_CACHE_DIR = 'assetcache'
+ASSET_MANIFEST = 'manifest.json'
+builtImages = None  # (file name, size) -> manifest entry, read on first use
+builtImagesLock = threading.Lock()
+
+
+def sourceStamp(fileName):
+    """
+    Identifies the version of a source image (modification time and size).
+    """
+    stat = os.stat(fileName)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def builtImagePath(fileName, size):
+    """
+    Returns the built file for fileName at size, or None if there is no
+    build or the source image changed since it was made.
+    """
+    global builtImages
+    with builtImagesLock:
+        if builtImages is None:
+            builtImages = {}
+            try:
+                with open(os.path.join(ASSET_CACHE_DIR, ASSET_MANIFEST)) as file:
+                    for entry in json.load(file)['images']:
+                        builtImages[(entry['source'], tuple(entry['size']))] = entry
+            except (OSError, ValueError, KeyError):
+                pass  # No usable build; load the originals
+    entry = builtImages.get((fileName, size))
+    try:
+        if entry is None or entry['stamp'] != sourceStamp(fileName):
+            return None
+    except OSError:
+        return None
+    path = os.path.join(ASSET_CACHE_DIR, entry['file'])
+    return path if os.path.exists(path) else None
+
+
+class BackgroundLayer:
+    """
+    A background image repeated across the world. Only the tiles that
+    overlap the viewport are drawn, so the cost does not depend on the
+    level length. parallax scales how fast the layer scrolls with the
+    camera: 1 moves with the ground, smaller values look further away.
+    """
+    def __init__(self, image, tileWidth, tileHeight, parallax=1.0, y=0):
+        self.image = image
+        self.tileWidth = tileWidth
+        self.tileHeight = tileHeight
+        self.parallax = parallax
+        self.y = y
+
+    def visibleTiles(self, cameraX, viewWidth, viewHeight):
+        """
+        Returns the screen positions of the tiles overlapping the viewport.
+        """
+        offset = cameraX * self.parallax
+        firstCol = math.floor(offset / self.tileWidth)
+        lastCol = math.ceil((offset + viewWidth) / self.tileWidth) - 1
+        rows = math.ceil((viewHeight - self.y) / self.tileHeight)
+        return [(col * self.tileWidth - offset, self.y + row * self.tileHeight)
+                for row in range(rows)
+                for col in range(firstCol, lastCol + 1)]
+
+    def draw(self, cameraX, viewWidth, viewHeight):
+        for x, y in self.visibleTiles(cameraX, viewWidth, viewHeight):
+            drawImage(self.image, x, y, width=self.tileWidth, height=self.tileHeight)
+
+
 class Environment:
     """
     Handles environmental elements and helper drawing functions.
     """
     
-    def openImage(fileName):
+    def openImage(fileName, size=None):
         """
         Opens an image file using PIL and returns the CMUImage object.
+        If size is given as (width, height), the image is resized once here
+        so drawImage does not scale it every frame. Images are cached, and
+        a version built ahead of time by buildassets.py is used if present.
         Adjusted to avoid using __file__.
         """
+        key = (fileName, size)
+        image = imageCache.get(key)
+        if image is not None:
+            return image
         try:
             # Attempt to open the image file directly
-            pilImage = PILImage.open(fileName)
-            return CMUImage(pilImage)
+            builtPath = builtImagePath(fileName, size) if size is not None else None
+            pilImage = PILImage.open(builtPath or fileName)
+            pilImage.load()  # Decode now, not at the first draw
+            if size is not None and pilImage.size != size:
+                pilImage = pilImage.resize(size, PILImage.LANCZOS)
+            image = CMUImage(pilImage)
+            imageCache.put(key, image)
+            return image
         except FileNotFoundError:
             # If the file is not found, provide an error message
             print(f"Error: The image file '{fileName}' was not found.")
@@ -30,60 +171,85 @@ class Environment:
         """
         drawPolygon(x1, y1, x2, y2, x3, y3, **kwargs)
         
+    def drawGlyph(shape, size, color, x, y):
+        """
+        Draws a cached glyph centered at (x, y). A glyph's shapes are worked
+        out once per (shape, size, color) and, where PIL is available,
+        rendered once into an image.
+        """
+        key = (shape, size, color)
+        glyph = glyphCache.get(key)
+        if glyph is None:
+            shapes = Environment.glyphShapes(shape, size, color)
+            if SpriteAtlas.available():
+                glyph = rasterizeShapes(shapes)
+            else:
+                glyph = shapes
+            glyphCache.put(key, glyph)
+        if isinstance(glyph, list):
+            drawShapes(translateShapes(glyph, x, y))
+        else:
+            image, left, top = glyph
+            drawImage(image, x + left, y + top)
+
+    def glyphShapes(shape, size, color):
+        """
+        Returns the shapes of a glyph centered at (0, 0).
+        """
+        if shape == 'heart':
+            points = []
+            for angle in range(0, 360, 10):
+                angleRad = math.radians(angle)
+                x = size * 16 * math.sin(angleRad)**3
+                y = - size * (13 * math.cos(angleRad) - 5 *\
+                              math.cos(2 * angleRad) - \
+                              2 * math.cos(3 * angleRad)\
+                              - math.cos(4 * angleRad))
+                points.append((x, y))
+            flatPoints = [coord for point in points for coord in point]
+            return [('Polygon', flatPoints, dict(fill=color))]
+        if shape == 'fish':
+            return [
+                # Body
+                ('Oval', (0, 0, size * 2, size), dict(fill=color)),
+                # Tail
+                ('Polygon', (-size, 0,
+                             -size * 1.5, -size / 2,
+                             -size * 1.5, size / 2), dict(fill=color)),
+                # Eye
+                ('Circle', (size / 2, -size / 4, size / 8), dict(fill="white")),
+                ('Circle', (size / 2, -size / 4, size / 16), dict(fill="black")),
+            ]
+        if shape == 'doubleJump':
+            # Wings; the '2x' label is drawn on top as text
+            return [('Arc', (-10, 0, 20, 20, 0, 180), dict(fill='white', border='gray')),
+                    ('Arc', (10, 0, 20, 20, 0, 180), dict(fill='white', border='gray'))]
+        if shape == 'magnet':
+            return [('Rect', (-10, -10, 20, 20), dict(fill='red')),
+                    ('Rect', (-10, -10, 10, 20), dict(fill='blue')),
+                    ('Circle', (-10, -10, 10), dict(fill='blue')),
+                    ('Circle', (10, -10, 10), dict(fill='red'))]
+        if shape == 'shield':
+            return [('Polygon', (0, -15, -12, 0, 0, 15, 12, 0),
+                     dict(fill='lightblue', border='blue', borderWidth=2))]
+        raise ValueError(f"Unknown glyph '{shape}'")
+
     def drawHeart(xCenter, yCenter, size, fillColor):
         """
         Draws a heart shape at the specified location.
         """
-        points = []
-        for angle in range(0, 360, 10):
-            angleRad = math.radians(angle)
-            x = xCenter + size * 16 * math.sin(angleRad)**3
-            y = yCenter - size * (13 * math.cos(angleRad) - 5 *\
-                                   math.cos(2 * angleRad) - \
-                                   2 * math.cos(3 * angleRad)\
-                                   - math.cos(4 * angleRad))
-            points.append((x, y))
-        flatPoints = [coord for point in points for coord in point]
-        drawPolygon(*flatPoints, fill=fillColor)
+        Environment.drawGlyph('heart', size, fillColor, xCenter, yCenter)
     
     def drawFish(x, y, size, fillColor):
         """
         Draws a fish at the specified location.
         """
-        # Body
-        drawOval(x, y, size * 2, size, fill=fillColor)
-        # Tail
-        drawPolygon(
-            x - size, y,
-            x - size * 1.5, y - size / 2,
-            x - size * 1.5, y + size / 2,
-            fill=fillColor
-        )
-        # Eye
-        drawCircle(x + size / 2, y - size / 4, size / 8, fill="white")
-        drawCircle(x + size / 2, y - size / 4, size / 16, fill="black")
+        Environment.drawGlyph('fish', size, fillColor, x, y)
     
     def drawPowerIcon(x, y, powerType):
         """
         Draws a realistic icon for the given power-up.
         """
+        Environment.drawGlyph(powerType, None, None, x, y)
         if powerType == 'doubleJump':
-            # Draw wings for double jump
-            drawArc(x - 10, y, 20, 20, 0, 180, fill='white', border='gray')
-            drawArc(x + 10, y, 20, 20, 0, 180, fill='white', border='gray')
             drawLabel('2x', x, y + 5, size=10, fill='black')
-        elif powerType == 'magnet':
-            # Draw a magnet shape
-            drawRect(x - 10, y - 10, 20, 20, fill='red')
-            drawRect(x - 10, y - 10, 10, 20, fill='blue')
-            drawCircle(x - 10, y - 10, 10, fill='blue')
-            drawCircle(x + 10, y - 10, 10, fill='red')
-        elif powerType == 'shield':
-            # Draw a shield
-            drawPolygon(
-                x, y - 15,
-                x - 12, y,
-                x, y + 15,
-                x + 12, y,
-                fill='lightblue', border='blue', borderWidth=2
-            )
\ No newline at end of file
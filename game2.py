@@ -1,10 +1,66 @@
 # game.py
 
-from cmu_graphics import *
-from environment import Environment
+from graphics import *
+from environment import Environment, BackgroundLayer
+from sprites import SpriteAtlas
+from hud import HudLayer
+from profiler import FrameProfiler
 from entities2 import *
+from spatial import PlatformIndex, TerrainProfile, SpatialHash
+from scheduler import UpdateScheduler, FixedTimestep
+from entitystore import EnemyStore, WALKER, CHASER
+from enemypool import EnemyPool
+from soundmanager import SoundManager
+from assetloader import AssetLoader
+from levelgen import LevelGenerator
+from levelcache import (openLevelFile, levelCachePath, buildLevelFileInBackground,
+                        defaultCacheDir)
 import random
 import math  
+import os
+import time
+
+# Sizes images are drawn at, so they are scaled once when loaded
+HERO_IMAGE_SIZE = (50, 50)                  # Hero radius 25
+ENEMY_IMAGE_SIZES = {'Walker': (50, 50),    # Drawn 2 radii wide
+                     'Chaser': (100, 100)}  # Drawn 4 radii wide
+BACKGROUND_TILE_SIZE = (801, 600)
+
+# Image files, drawn at the sizes above (buildassets.py pre-scales them)
+# Start screens created using Canva, characters and dogs from vecteezy
+START_SCREEN_IMAGE = 'starting.png'
+DIFFICULTY_SCREEN_IMAGES = ['design.png']
+CHARACTER_IMAGES = {
+    'Super Cat': ['cat2.png', 'cat3.png'],
+    'Animation Cat': []  # No images for Animation Cat; handled programmatically
+}
+ENEMY_IMAGES = {
+    'Walker': ['dog11.png', 'dog12.png', 'dog13.png'],
+    'Chaser': ['dog01.png', 'dog02.png']
+}
+BACKGROUND_IMAGES = {'Super Cat': 'backgroundSuperCat.png'}
+
+# All sounds downloaded from pixabay
+SOUND_FILES = {
+    'jump': 'jump.mp3',
+    'gameBackground': 'game-start.mp3',
+    'gameOver': 'game-over.mp3',
+    'superPower': 'game-bonus.mp3'
+}
+
+def imageAssets(width, height):
+    """
+    Returns the (file name, size) of every image the game loads in a
+    width x height window.
+    """
+    assets = [(START_SCREEN_IMAGE, (width, height))]
+    assets += [(imageFile, (width, height)) for imageFile in DIFFICULTY_SCREEN_IMAGES]
+    for imageFiles in CHARACTER_IMAGES.values():
+        assets += [(imageFile, HERO_IMAGE_SIZE) for imageFile in imageFiles]
+    for enemyType, imageFiles in ENEMY_IMAGES.items():
+        assets += [(imageFile, ENEMY_IMAGE_SIZES[enemyType]) for imageFile in imageFiles]
+    assets += [(imageFile, BACKGROUND_TILE_SIZE) for imageFile in BACKGROUND_IMAGES.values()]
+    return assets
 
 class Game:
     """
@@ -12,7 +68,8 @@ class Game:
     """
     def __init__(self):
         # Initialize game parameters
-        self.stepsPerSecond = 30  # Game updates per second
+        self.setStepRate(30)  # Simulation steps per second
+        self.stepClock = FixedTimestep()  # Real time to simulation steps
         self.levelNumber = 1      # Starting level
         self.paused = False       # Game paused state
         self.difficulty = None    # Difficulty level
@@ -39,14 +96,150 @@ class Game:
         self.selectedCharacter = None    # Tracks the chosen character
         self.enemyImages = {}
         self.enemyImagesLoaded = {}
+        self.backgroundImages = {}
+        self.assetLoader = None      # Background loading, see loadAssets
+        self.assetsRequested = False # Assets are loaded once per game
+        self.assetTimes = None       # (time to first frame, to all assets)
+        self.backgroundLayers = {}   # Character -> BackgroundLayer list
+        self.spriteAtlas = None      # Pre-rendered drawn characters
+        self.hudLayer = HudLayer()
+        self.profiler = FrameProfiler()  # Toggled with F, dumped with Shift+F
         self.selectedEnemyImages = None
-        self.sounds = {}
+        self.sounds = SoundManager(SOUND_FILES)  # Played at the end of each frame
         self.gameOverSoundPlayed = False  # Tracks if game over sound has been played
+        self.enemyStore = None  # Array-backed enemies, see enableEntityStore
+        self.enemies = []
+        self.maxEnemies = 50    # Most enemies the periodic spawner keeps alive
+        self.enemyPool = EnemyPool(maxFree=self.maxEnemies)  # Recycled enemies
+        self.seed = None        # Session seed for level generation
+        # Where generated levels are cached (None disables the cache)
+        self.levelCacheDir = defaultCacheDir()
+        self.createScheduler()
 
     def onAppStart(self):
         """
         Initializes the game when the app starts.
         """
+        self.layoutButtons()
+        self.startScreenStage = 'characterSelection'
+        if not HEADLESS and not self.assetsRequested:
+            self.loadAssets()
+
+        # Play background music on the start screen
+        self.sounds.play('gameBackground', loop=True)
+
+    def loadAssets(self):
+        """
+        Starts loading the images and sounds in the background, the ones
+        for the start screen first. collectAssets puts each one in place
+        as it arrives; until then the screens draw without it. Skipped
+        without a window (headless runs and replays), where only the
+        simulation is used. Returning to the menu keeps what was loaded.
+        """
+        self.assetsRequested = True
+        self.assetLoader = AssetLoader()
+        loader = self.assetLoader
+        screenSize = (self.width, self.height)
+
+        # Load the start screen image and its music
+        loader.request('startScreen', Environment.openImage, START_SCREEN_IMAGE,
+                       screenSize)
+        loader.request('gameBackgroundSound', self.sounds.loadClip, 'gameBackground')
+
+        # Initialize character selection
+        self.availableCharacters = ['Super Cat', 'Animation Cat']
+        self.characterImages = CHARACTER_IMAGES
+        for character, imageFiles in self.characterImages.items():
+            loader.request(('hero', character), self.loadImages, imageFiles,
+                           HERO_IMAGE_SIZE)
+
+        # Load the start screen images for difficulty selection
+        loader.request('difficultyScreen', self.loadImages,
+                       DIFFICULTY_SCREEN_IMAGES, screenSize)
+
+        # The rest is only needed once the game starts
+        self.availableEnemies = ['Walker', 'Chaser']
+        self.enemiesImages = ENEMY_IMAGES
+        if self.currentCharacterIndex == 0:
+            # Load images for Walker and Chaser enemies
+            for enemyType, imageFiles in self.enemiesImages.items():
+                loader.request(('enemy', enemyType), self.loadImages, imageFiles,
+                               ENEMY_IMAGE_SIZES[enemyType])
+
+        # Load background images for each character
+        # (no background image for Animation Cat)
+        for character, imageFile in BACKGROUND_IMAGES.items():
+            loader.request(('background', character), Environment.openImage,
+                           imageFile, BACKGROUND_TILE_SIZE)
+
+        # Render the drawn characters once; kept when returning to the menu
+        if self.spriteAtlas is None and SpriteAtlas.available():
+            loader.request('spriteAtlas', createSpriteAtlas)
+
+        # Decoded only the first time; kept when returning to the menu
+        for name in self.sounds.files:
+            if name != 'gameBackground':
+                loader.request(name + 'Sound', self.sounds.loadClip, name)
+
+    def loadImages(self, imageFiles, size):
+        """
+        Loads a list of images at the given size, leaving out missing ones.
+        """
+        images = []
+        for imageFile in imageFiles:
+            img = Environment.openImage(imageFile, size)
+            if img:
+                images.append(img)
+            else:
+                print(f"Error: The image file '{imageFile}' was not found.")
+        return images
+
+    def collectAssets(self):
+        """
+        Puts the assets that finished loading in place. Called every frame
+        until everything is loaded.
+        """
+        loader = self.assetLoader
+        for key, asset in loader.take().items():
+            if key == 'startScreen':
+                self.startScreenImage = asset
+                if asset is None:
+                    print(f"Error: The image file '{START_SCREEN_IMAGE}' was not found.")
+            elif key == 'difficultyScreen':
+                self.startScreenImages = asset
+                self.currentStartScreenImageIndex = 0
+            elif key == 'spriteAtlas':
+                self.spriteAtlas = asset
+            elif key[0] == 'hero':
+                character = key[1]
+                self.heroImages[character] = asset
+                if self.selectedCharacter == character:
+                    # Swap the placeholder drawing for the images
+                    self.selectedHeroImages = asset
+                    if hasattr(self, 'hero'):
+                        self.hero.images = asset
+            elif key[0] == 'enemy':
+                self.enemyImages[key[1]] = asset
+            elif key[0] == 'background':
+                character = key[1]
+                if asset is None:
+                    print(f"Error: The background image for '{character}' was not found.")
+                    continue
+                self.backgroundImages[character] = asset
+                # Background layers drawn behind the level, furthest first
+                self.backgroundLayers[character] = [
+                    BackgroundLayer(asset, *BACKGROUND_TILE_SIZE)]
+        timings = loader.timings()
+        if not loader.pending() and None not in timings:
+            print(f"Assets loaded: {loader.report()}")
+            self.assetTimes = timings
+            self.assetLoader = None
+
+    def layoutButtons(self):
+        """
+        Places the difficulty buttons and the in-game pause and exit buttons
+        for the window size.
+        """
         # Define pause button dimensions and position
         self.pauseButton = {
             'x': self.width - 50,
@@ -62,73 +255,6 @@ class Game:
             'height': self.pauseButton['height']
         }
 
-        # Load the start screen image
-        # Created using Canva
-        self.startScreenImage = Environment.openImage('starting.png')
-        if self.startScreenImage is None:
-            print("Error: The image file 'starting.png' was not found.")
-
-        # Initialize character selection
-        self.availableCharacters = ['Super Cat', 'Animation Cat']
-        # Images from vecteezy
-        self.characterImages = {
-            'Super Cat': ['cat2.png', 'cat3.png'],
-            'Animation Cat': []  # No images for Animation Cat; handled programmatically
-        }
-        # Load images for 'Super Cat'
-        for character in self.characterImages:
-            images = []
-            for imageFile in self.characterImages[character]:
-                img = Environment.openImage(imageFile)
-                if img:
-                    images.append(img)
-                else:
-                    print(f"Error: The image file '{imageFile}' was not found.")
-            self.heroImages[character] = images
-        
-        self.availableEnemies = ['Walker', 'Chaser']
-        # Images from vecteezy
-        self.enemiesImages = {
-            'Walker': ['dog11.png', 'dog12.png', 'dog13.png'],
-            'Chaser': ['dog01.png', 'dog02.png']
-        }
-        if self.currentCharacterIndex == 0:
-            # Load images for Walker and Chaser enemies
-            for enemyType in self.enemiesImages:
-                images = []
-                for imageFile in self.enemiesImages[enemyType]:
-                    img = Environment.openImage(imageFile)
-                    if img:
-                        images.append(img)
-                    else:
-                        print(f"Error: The image file '{imageFile}' was not found.")
-                self.enemyImages[enemyType] = images
-
-        # All sounds downloaded from pixabay
-        self.sounds = {
-            'jump': Sound('jump.mp3'),
-            'gameBackground': Sound('game-start.mp3'),
-            'gameOver': Sound('game-over.mp3'),
-            'superPower': Sound('game-bonus.mp3')
-        }
-
-        # Play background music on the start screen
-        if 'gameBackground' in self.sounds and self.sounds['gameBackground']:
-            self.sounds['gameBackground'].play(loop=True)
-        
-        # Set start screen stage to 'characterSelection'
-        self.startScreenStage = 'characterSelection'
-
-        # Load the start screen images for difficulty selection
-        # Created them using Canva
-        imageFiles = ['design.png']
-        for imageFile in imageFiles:
-            img = Environment.openImage(imageFile)
-            if img:
-                self.startScreenImages.append(img)
-            else:
-                print(f"Error: The image file '{imageFile}' was not found.")
-
         # Define Easy button
         self.easyButton = {
             'x': self.width / 2 - 100,  # Centered horizontally
@@ -146,15 +272,6 @@ class Game:
             'height': 50,             # Button height
             'label': 'Hard'           # Button label
         }
-        # Load background images for each character
-        self.backgroundImages = {
-            'Super Cat': Environment.openImage('backgroundSuperCat.png'),
-            # No background image for Animation Cat
-        }
-        # Check if background images loaded successfully
-        for character, bgImage in self.backgroundImages.items():
-            if bgImage is None:
-                print(f"Error: The background image for '{character}' was not found.")
 
     def onMousePress(self, x, y):
         """
@@ -183,13 +300,11 @@ class Game:
                 btn['y'] <= y <= btn['y'] + btn['height']):
                 self.paused = not self.paused  # Toggle pause state
                 if self.paused:
-                    # Pause background music if it's playing
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                        self.sounds['gameBackground'].pause()
+                    # Pause background music
+                    self.sounds.pause('gameBackground')
                 else:
                     # Resume background music
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].pause():
-                        self.sounds['gameBackground'].play(loop=True)
+                    self.sounds.play('gameBackground', loop=True)
             # Check if the exit button was clicked
             exitBtn = self.exitButton
             if (exitBtn['x'] <= x <= exitBtn['x'] + exitBtn['width'] and
@@ -197,13 +312,7 @@ class Game:
                 # Go back to main menu (start screen)
                 self.mode = 'startScreen'
                 self.startScreenStage = 'characterSelection'  # Reset to character selection
-                self.onAppStart()  # Re-initialize the app
-                # Stop background music
-                if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                    self.sounds['gameBackground'].pause()
-                # Play starting sound (using the same background music)
-                if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].pause():
-                    self.sounds['gameBackground'].play(loop=True)
+                self.onAppStart()  # Re-initialize the app (and its music)
 
     def onKeyHold(self, keys):
         """
@@ -225,13 +334,7 @@ class Game:
         if key.lower() == 'e':
             self.mode = 'startScreen'
             self.startScreenStage = 'characterSelection'  # Reset to character selection
-            self.onAppStart()  # Re-initialize the app
-            # Stop background music and play starting sound
-            if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                self.sounds['gameBackground'].pause()
-            # Play starting sound (using the same background music)
-            if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].pause():
-                self.sounds['gameBackground'].play(loop=True)
+            self.onAppStart()  # Re-initialize the app (and its music)
                     
         if self.mode == 'startScreen':
             if self.startScreenStage == 'characterSelection':
@@ -253,44 +356,48 @@ class Game:
                 elif self.difficulty and (key == 'enter' or key == 'space'):
                     self.startGame()
         elif self.mode == 'game':
-            if key.lower() == 'p':
+            if key == 'f':
+                self.profiler.toggle()
+            elif key == 'F':
+                path = time.strftime('frames-%Y%m%d-%H%M%S.csv')
+                self.profiler.dump(path)
+                print(f"Wrote {len(self.profiler.frames)} profiled frames to {path}")
+            elif key.lower() == 'p':
                 self.paused = not self.paused  # Toggle pause state
                 if self.paused:
-                    # Pause background music if it's playing
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                        self.sounds['gameBackground'].pause()
+                    # Pause background music
+                    self.sounds.pause('gameBackground')
                 else:
                     # Resume background music
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].pause():
-                        self.sounds['gameBackground'].play(loop=True)
+                    self.sounds.play('gameBackground', loop=True)
             elif not self.gameOver and not self.levelComplete and not self.paused:
                 if key == 'up':
                     # Handle jumping logic
+                    jumped = False
                     if self.hero.onGround:
                         self.hero.dy = self.hero.jumpStrength
+                        jumped = True
                     elif self.hero.doubleJumpCount > 0:
                         self.hero.dy = self.hero.jumpStrength
                         self.hero.doubleJumpCount -= 1
-                    # Play jump sound
-                    if 'jump' in self.sounds and self.sounds['jump']:
-                        self.sounds['jump'].play()
+                        jumped = True
+                    # Play jump sound only when the hero actually jumps
+                    if jumped:
+                        self.sounds.play('jump')
             elif self.gameOver:
                 if key.lower() == "r":
                     self.levelNumber = 1
                     self.reset(level=self.levelNumber, resetScore=True)
                     # Stop game over sound
-                    if 'gameOver' in self.sounds and self.sounds['gameOver'] and self.sounds['gameOver'].play():
-                        self.sounds['gameOver'].pause()
+                    self.sounds.pause('gameOver')
                     # Play background music
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground']:
-                        self.sounds['gameBackground'].play(loop=True)
+                    self.sounds.play('gameBackground', loop=True)
             elif self.levelComplete:
                 if key.lower() == "n":
                     self.levelNumber += 1
                     self.reset(level=self.levelNumber, resetScore=False)
                     # Ensure background music is playing
-                    if 'gameBackground' in self.sounds and self.sounds['gameBackground']:
-                        self.sounds['gameBackground'].play(loop=True)
+                    self.sounds.play('gameBackground', loop=True)
 
     def startGame(self):
         """
@@ -307,9 +414,31 @@ class Game:
             self.hero.lives = 3
             self.spawnRate = 4  # Enemies spawn more frequently
 
-    def onStep(self):
+    def setStepRate(self, stepsPerSecond):
+        """
+        Sets the simulation rate; dt is the length of a step in seconds.
+        """
+        self.stepsPerSecond = stepsPerSecond
+        self.dt = 1 / stepsPerSecond
+
+    def onStep(self, elapsed=None):
+        """
+        Advances the game by elapsed seconds of real time, as fixed steps
+        of dt seconds. Without elapsed, runs exactly one step (headless
+        runs and replays). Returns the number of steps run.
         """
-        Updates the game state each frame.
+        if self.assetLoader is not None:
+            self.collectAssets()
+        steps = 1 if elapsed is None else self.stepClock.advance(elapsed, self.dt)
+        for _ in range(steps):
+            self.simulate()
+        # Play the sounds requested this frame
+        self.sounds.flush()
+        return steps
+
+    def simulate(self):
+        """
+        Updates the game state by one step.
         """
         if self.mode == 'startScreen':
             # Alternate start screen images if any
@@ -320,258 +449,397 @@ class Game:
                     self.currentStartScreenImageIndex = (self.currentStartScreenImageIndex + 1) % len(self.startScreenImages)
         if self.mode == 'game':
             if not self.gameOver and not self.levelComplete and not self.paused:
-                self.blips += 1  # Increment timer for enemy spawning
-                # Spawn enemies periodically
-                if self.blips % (self.spawnRate * self.stepsPerSecond) == 0:
-                    # Spawn Walker or Chaser based on logic
-                    enemyX = self.cameraX + self.width - 100
-                    if random.random() < 0.7:  # 70% chance to spawn Walker
-                        if self.currentCharacterIndex == 0:
-                            self.enemies.append(Walker(enemyX, self.groundHeight - 25, self, images=self.enemyImages.get('Walker', [])))
-                        else:
-                            self.enemies.append(Walker(enemyX, self.groundHeight - 25, self))
-                    else:
-                        if self.currentCharacterIndex == 0:
-                            self.enemies.append(Chaser(enemyX, self.groundHeight - 25, self, images=self.enemyImages.get('Chaser', [])))
-                        else:
-                            self.enemies.append(Chaser(enemyX, self.groundHeight - 25, self))
-
-                # Update enemies
-                for enemy in self.enemies:
-                        enemy.onStep(self)
-
-                # Update Hero
-                self.hero.onStep(self)
-
-                # Update Camera Position to Follow Hero
-                if (self.hero.x - self.cameraX > self.width * 2 / 3 and
-                    self.cameraX + self.width < self.worldWidth):
-                    self.cameraX += self.hero.speed
-                elif (self.hero.x - self.cameraX < self.width / 3 and
-                      self.cameraX > 0):
-                    self.cameraX -= self.hero.speed
-
-                # Clamp cameraX within world boundaries
-                self.cameraX = max(0, min(self.cameraX, self.worldWidth - self.width))
-
-                # Update Enemies
-                for enemy in self.enemies[:]:
-                    enemy.onStep(self)
-                    if enemy.lifeTimer <= 0:
-                        if enemy.x + enemy.radius*2 < self.cameraX - 100:
-                            self.enemies.remove(enemy)  # Enemy has been removed
-
-                    # Check for collision with the hero
-                    if self.hero.checkCollision(enemy):
-                        if self.hero.shieldActive:
-                            # Shield absorbs the damage
-                            self.enemies.remove(enemy)
-                        elif self.hero.dy > 0:
-                            # Hero defeats the enemy by jumping on top
-                            self.enemies.remove(enemy)
-                            self.hero.dy = self.hero.jumpStrength / 2  # Bounce back
-                            self.hero.score += 50
-                        else:
-                            # Enemy defeats the hero
-                            self.hero.lives -= 1
-                            # Play game over sound if hero has no lives left
-                            if self.hero.lives <= 0:
-                                self.gameOver = True
-                                if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                                    self.sounds['gameBackground'].pause()
-                                if 'gameOver' in self.sounds and self.sounds['gameOver']:
-                                    self.sounds['gameOver'].play()
-                            else:
-                                # Reset hero position
-                                self.hero.x = self.width / 5
-                                self.hero.y = self.groundHeight - self.hero.radius
-                                self.cameraX = 0
-                                self.enemies.clear()
-
-                # Remove enemies that have moved off-screen to the left
-                self.enemies = [enemy for enemy in self.enemies
-                               if enemy.x + enemy.radius >= self.cameraX - 100]
-
-                # Update Collectibles
-                for collectible in self.collectibles[:]:
-                    if not collectible.collected:
-                        collectible.moveTowardsHero(self.hero)
-                        if collectible.checkCollection(self.hero):
-                            self.hero.score += 10
-                            self.collectibles.remove(collectible)
-                    elif collectible.x + collectible.radius < self.cameraX - 100:
-                        # Remove collectibles that are off-screen to the left
-                        self.collectibles.remove(collectible)
-
-                # Update Power-Ups
-                for powerUp in self.powerUps[:]:
-                    if (not powerUp.collected and
-                        powerUp.checkCollection(self.hero, self)):
-                        self.powerUps.remove(powerUp)
-                        # Play super power sound
-                        if 'superPower' in self.sounds and self.sounds['superPower']:
-                            self.sounds['superPower'].play()
-                    elif powerUp.x + powerUp.radius < self.cameraX - 100:
-                        # Remove power-ups that are off-screen to the left
-                        self.powerUps.remove(powerUp)
-
-                # Update Moving Platforms
-                for platform in self.platforms:
-                    platform.onStep(self)
-
-                # Check if hero fell into a hole
-                if self.hero.y - self.hero.radius > self.groundHeight:
-                    self.hero.lives -= 1
-                    # Play game over sound if hero has no lives left
-                    if self.hero.lives <= 0:
-                        self.gameOver = True
-                        if 'gameBackground' in self.sounds and self.sounds['gameBackground'] and self.sounds['gameBackground'].play():
-                            self.sounds['gameBackground'].pause()
-                        if 'gameOver' in self.sounds and self.sounds['gameOver']:
-                            self.sounds['gameOver'].play()
-                    else:
-                        # Reset hero position
-                        self.hero.x = self.width / 5
-                        self.hero.y = self.groundHeight - self.hero.radius
-                        self.cameraX = 0
-                        self.enemies.clear()
-
-                # Check for Level Completion
-                if self.hero.x >= self.worldWidth - self.width / 2:
-                    self.levelComplete = True
-
-                # Prevent Hero from moving out of bounds
-                if self.hero.x - self.hero.radius < 0:
-                    self.hero.x = self.hero.radius
-                elif self.hero.x + self.hero.radius > self.worldWidth:
-                    self.hero.x = self.worldWidth - self.hero.radius
-
-    def generatePlatforms(self, x, level):
-        """
-        Recursively generates platforms with varying sizes and positions.
-        """
-        if x >= self.worldWidth:
-            return
-        # Randomize platform attributes
-        width = random.randint(100, 250)
-        height = 20
-        y = random.randint(int(self.groundHeight * 0.5),
-                           int(self.groundHeight * 0.8))
-        self.platforms.append(Platform(x, y, width, height))
-        # Recursive call with increased x position
-        gap = random.randint(75, 100)
-        self.generatePlatforms(x + width + gap, level)
+                # Spawn, think, move, collide, pick up, cull -- in that order
+                self.scheduler.run(self.profiler.stepTimes()
+                                   if self.profiler.enabled else None)
 
-    def generateMovingPlatforms(self, x, level):
+    def createScheduler(self):
         """
-        Generates moving platforms.
+        Registers the per-frame work of each kind of entity into the update
+        phases. Every entity is updated exactly once per frame.
         """
-        for _ in range(5):  # Number of moving platforms
-            width = random.randint(100, 150)
-            height = 20
-            y = random.randint(int(self.groundHeight * 0.3),
-                               int(self.groundHeight * 0.6))
-            movingPlatform = Platform(x, y, width, height, moving=True)
-            self.platforms.append(movingPlatform)
-            x += random.randint(500, 800)
-
-    def generateHoles(self, x, level):
+        self.scheduler = UpdateScheduler()
+        self.scheduler.register('spawn', self.streamChunks)
+        self.scheduler.register('spawn', self.spawnEnemies)
+        self.scheduler.register('ai', self.updateEnemyAI)
+        self.scheduler.register('integrate', self.updatePlatforms)
+        self.scheduler.register('integrate', self.updateEnemies)
+        self.scheduler.register('integrate', self.updateHero)
+        self.scheduler.register('integrate', self.updateCamera)
+        self.scheduler.register('collisions', self.resolveEnemyCollisions)
+        self.scheduler.register('collisions', self.resolveStoreCollisions)
+        self.scheduler.register('collisions', self.resolveHeroBounds)
+        self.scheduler.register('pickups', self.updateCollectibles)
+        self.scheduler.register('pickups', self.updatePowerUps)
+        self.scheduler.register('cull', self.cullEntities)
+
+    def spawnEnemies(self):
         """
-        Generates holes in the ground.
+        Spawns a Walker or Chaser at the right edge of the screen periodically,
+        unless maxEnemies are already alive.
         """
-        while x < self.worldWidth:
-            width = random.randint(80, 150)
-            self.holes.append(Hole(x, width))
-            x += width + random.randint(200, 500)
+        self.blips += 1  # Increment timer for enemy spawning
+        if (self.blips % (self.spawnRate * self.stepsPerSecond) == 0 and
+            self.enemyCount() < self.maxEnemies):
+            self.spawnEnemy(self.cameraX + self.width - 100)
 
-    def generateCollectibles(self, x, level):
+    def spawnEnemy(self, enemyX):
         """
-        Recursively generates collectibles on platforms.
+        Spawns a Walker or Chaser standing on the ground at enemyX.
         """
-        if x >= self.worldWidth:
-            return
-        # Find a platform near the x position
-        platform = next((p for p in self.platforms
-                         if p.x <= x <= p.x + p.width), None)
-        if platform:
-            collectibleY = platform.y - 20
+        enemyClass = Walker if random.random() < 0.7 else Chaser  # 70% Walkers
+        if self.enemyStore is not None:
+            lifeTimer = random.randint(25 * self.stepsPerSecond,
+                                       35 * self.stepsPerSecond)
+            kind = WALKER if enemyClass is Walker else CHASER
+            self.enemyStore.spawn(enemyX, self.groundHeight - 25, kind, lifeTimer)
+        elif self.currentCharacterIndex == 0:
+            self.addEnemy(self.enemyPool.acquire(
+                enemyClass, enemyX, self.groundHeight - 25, self,
+                images=self.enemyImages.get(enemyClass.__name__, [])))
         else:
-            collectibleY = random.randint(int(self.groundHeight * 0.3),
-                                          int(self.groundHeight * 0.6))
-        self.collectibles.append(Collectible(x, collectibleY, color="orange"))
-        # Recursive call with increased x position
-        gap = random.randint(0, 250)
-        self.generateCollectibles(x + gap, level)
+            self.addEnemy(self.enemyPool.acquire(enemyClass, enemyX,
+                                                 self.groundHeight - 25, self))
+
+    def enableEntityStore(self):
+        """
+        Switches enemies to the NumPy-backed EnemyStore, which updates them
+        all in batch operations. Meant for crowd-heavy sessions with
+        hundreds of dogs. Returns False if NumPy is not installed.
+        """
+        if not EnemyStore.available():
+            return False
+        self.clearEnemies()
+        self.enemyStore = EnemyStore()
+        return True
+
+    def storeImageCounts(self):
+        """
+        Number of animation images for stored Walkers and Chasers.
+        """
+        if self.currentCharacterIndex != 0:
+            return (0, 0)
+        return (len(self.enemyImages.get('Walker', [])),
+                len(self.enemyImages.get('Chaser', [])))
+
+    def enemyCount(self):
+        count = len(self.enemies)
+        if self.enemyStore is not None:
+            count += self.enemyStore.count
+        return count
+
+    def updateEnemyAI(self):
+        """
+        Lets every enemy decide how it moves this frame.
+        """
+        for enemy in self.enemies:
+            enemy.think(self)
+        if self.enemyStore is not None:
+            self.enemyStore.think(self)
+
+    def updatePlatforms(self):
+        """
+        Moves the moving platforms.
+        """
+        for platform in self.platformIndex.dynamic:
+            platform.onStep(self)
+
+    def updateEnemies(self):
+        """
+        Applies physics and lifetime to every enemy.
+        """
+        for enemy in self.enemies:
+            enemy.integrate(self)
+            self.broadPhase.move(enemy)
+        if self.enemyStore is not None:
+            self.enemyStore.integrate(self, imageCounts=self.storeImageCounts())
+
+    def updateHero(self):
+        self.hero.onStep(self)
+
+    def updateCamera(self):
+        """
+        Scrolls the camera to follow the hero.
+        """
+        if (self.hero.x - self.cameraX > self.width * 2 / 3 and
+            self.cameraX + self.width < self.worldWidth):
+            self.cameraX += self.hero.speed * self.dt
+        elif (self.hero.x - self.cameraX < self.width / 3 and
+              self.cameraX > 0):
+            self.cameraX -= self.hero.speed * self.dt
+
+        # Clamp cameraX within world boundaries
+        self.cameraX = max(0, min(self.cameraX, self.worldWidth - self.width))
+
+    def resolveEnemyCollisions(self):
+        """
+        Handles the hero touching the enemies near it.
+        """
+        for enemy in self.broadPhase.query(self.hero.x, self.hero.y,
+                                           self.hero.radius, Enemy):
+            if enemy.lifeTimer <= 0 or not self.hero.checkCollision(enemy):
+                continue
+            if self.hero.shieldActive:
+                # Shield absorbs the damage
+                self.removeEnemy(enemy)
+            elif self.hero.dy > 0:
+                # Hero defeats the enemy by jumping on top
+                self.removeEnemy(enemy)
+                self.hero.dy = self.hero.jumpStrength / 2  # Bounce back
+                self.hero.score += 50
+            else:
+                # Enemy defeats the hero
+                self.loseLife()
+                if not self.gameOver:
+                    break  # Hero was moved back to the start
 
-    def generatePowerUps(self, x, level):
+    def resolveStoreCollisions(self):
         """
-        Recursively generates power-ups on platforms.
+        Handles the hero touching enemies kept in the entity store.
         """
-        if x >= self.worldWidth:
+        if self.enemyStore is None:
             return
-        # Find a platform near the x position
-        platform = next((p for p in self.platforms
-                         if p.x <= x <= p.x + p.width), None)
-        if platform:
-            powerUpY = platform.y - 30
-        else:
-            powerUpY = random.randint(int(self.groundHeight * 0.1),
-                                      int(self.groundHeight * 0.5))
-        powerTypes = ['doubleJump', 'magnet', 'shield']
-        powerType = random.choice(powerTypes)
-        self.powerUps.append(PowerUp(x, powerUpY, powerType))
-        # Recursive call with increased x position
-        gap = random.randint(500, 1000)
-        self.generatePowerUps(x + gap, level)
-
-    def generateClouds(self, x, level):
-        """
-        Generates clouds in the background.
-        """
-        cloudGap = 800
-        while x < self.worldWidth + self.width:
-            y = random.randint(50, int(self.groundHeight * 0.3))
-            size = random.randint(60, 120)
-            self.clouds.append(Cloud(x, y, size=size))
-            x += cloudGap
+        defeated = []
+        for i in self.enemyStore.touching(self.hero):
+            if self.hero.shieldActive:
+                # Shield absorbs the damage
+                defeated.append(i)
+            elif self.hero.dy > 0:
+                # Hero defeats the enemy by jumping on top
+                defeated.append(i)
+                self.hero.dy = self.hero.jumpStrength / 2  # Bounce back
+                self.hero.score += 50
+            else:
+                # Enemy defeats the hero
+                self.loseLife()
+                if not self.gameOver:
+                    return  # Hero was moved back and the store cleared
+        self.enemyStore.remove(defeated)
 
-    def reset(self, level=1, resetScore=True):
+    def resolveHeroBounds(self):
         """
-        Resets the game state for a new level or restart.
+        Handles the hero falling into a hole, finishing the level or
+        walking off the edge of the world.
         """
-        self.blips = 0  # Timer for spawning enemies
-        self.groundHeight = 2 * self.height / 3  # Height of the ground
-        self.bushRadius = 50  # Not used but can be for decorations
+        # Check if hero fell into a hole
+        if self.hero.y - self.hero.radius > self.groundHeight:
+            self.loseLife()
 
-        # Increase world width with each level
-        self.worldWidth = 4000 * (1.5 ** (level - 1))
+        # Check for Level Completion
+        if self.hero.x >= self.worldWidth - self.width / 2:
+            self.levelComplete = True
 
-        # Generate platforms recursively
-        self.platforms = []
-        self.generatePlatforms(x=100, level=level)
+        # Prevent Hero from moving out of bounds
+        if self.hero.x - self.hero.radius < 0:
+            self.hero.x = self.hero.radius
+        elif self.hero.x + self.hero.radius > self.worldWidth:
+            self.hero.x = self.worldWidth - self.hero.radius
 
-        # Generate moving platforms
-        self.generateMovingPlatforms(x=500, level=level)
+    def loseLife(self):
+        """
+        Takes a life from the hero and either ends the game or sends the
+        hero back to the start of the level.
+        """
+        self.hero.lives -= 1
+        # Play game over sound if hero has no lives left
+        if self.hero.lives <= 0:
+            self.gameOver = True
+            self.sounds.pause('gameBackground')
+            self.sounds.play('gameOver')
+        else:
+            # Reset hero position
+            self.hero.x = self.width / 5
+            self.hero.y = self.groundHeight - self.hero.radius
+            self.cameraX = 0
+            self.clearEnemies()
 
-        # Generate holes in the ground (only in hard mode)
-        self.holes = []
-        if self.difficulty != 'Easy':
-            self.generateHoles(x=300, level=level)
+    def updateCollectibles(self):
+        """
+        Pulls in collectibles within magnet range and collects the ones
+        touching the hero.
+        """
+        if self.hero.magnetActive:
+            for collectible in self.broadPhase.query(self.hero.x, self.hero.y,
+                                                     MAGNET_RANGE, Collectible):
+                collectible.moveTowardsHero(self.hero, self.dt)
+                self.broadPhase.move(collectible)
+
+        for collectible in self.broadPhase.query(self.hero.x, self.hero.y,
+                                                 self.hero.radius, Collectible):
+            if collectible.checkCollection(self.hero):
+                self.hero.score += 10
+                self.collectibles.remove(collectible)
+                self.broadPhase.remove(collectible)
+
+    def updatePowerUps(self):
+        """
+        Collects the power-ups touching the hero.
+        """
+        for powerUp in self.broadPhase.query(self.hero.x, self.hero.y,
+                                             self.hero.radius, PowerUp):
+            if powerUp.checkCollection(self.hero, self):
+                self.powerUps.remove(powerUp)
+                self.broadPhase.remove(powerUp)
+                # Play super power sound
+                self.sounds.play('superPower')
+
+    def cullEntities(self):
+        """
+        Removes expired enemies and those left behind off-screen. Level items
+        behind the camera go away with their chunk (see streamChunks).
+        """
+        # Remove enemies whose time is up or that moved off-screen to the
+        # left, compacting the list in place
+        enemies = self.enemies
+        kept = 0
+        for enemy in enemies:
+            if (enemy.lifeTimer <= 0 or
+                enemy.x + enemy.radius < self.cameraX - 100):
+                self.broadPhase.remove(enemy)
+                self.enemyPool.release(enemy)
+            else:
+                enemies[kept] = enemy
+                kept += 1
+        del enemies[kept:]
+        if self.enemyStore is not None:
+            self.enemyStore.cull(self.cameraX)
 
-        # Generate collectibles recursively
-        self.collectibles = []
-        self.generateCollectibles(x=500, level=level)
+    def addEnemy(self, enemy):
+        """
+        Adds an enemy to the level and the broad-phase grid.
+        """
+        self.enemies.append(enemy)
+        self.broadPhase.insert(enemy)
 
-        # Generate power-ups recursively
-        self.powerUps = []
-        self.generatePowerUps(x=700, level=level)
+    def removeEnemy(self, enemy):
+        """
+        Removes an enemy from the level and the broad-phase grid, and
+        returns it to the pool.
+        """
+        if enemy in self.enemies:
+            self.enemies.remove(enemy)
+            self.enemyPool.release(enemy)
+        self.broadPhase.remove(enemy)
+
+    def clearEnemies(self):
+        """
+        Removes every enemy from the level.
+        """
+        for enemy in self.enemies:
+            self.broadPhase.remove(enemy)
+            self.enemyPool.release(enemy)
+        self.enemies.clear()
+        if self.enemyStore is not None:
+            self.enemyStore.clear()
+
+    def openLevel(self, level):
+        """
+        Returns where the level's content comes from: the cached level file,
+        mapped into memory, if there is one; otherwise a generator, which the
+        chunk streamer reads from as the camera moves.
+        """
+        key = (self.seed, level, self.difficulty, self.width, self.height)
+        if self.levelCacheDir is not None:
+            levelData = openLevelFile(levelCachePath(self.levelCacheDir, *key))
+            if levelData is not None:
+                return levelData
+        return LevelGenerator(*key)
+
+    def cacheNextLevel(self, level):
+        """
+        Builds the file of the level after this one in the background, so
+        moving on is a file map. Called once the current level's first
+        chunks are loaded, so the build never competes with them.
+        """
+        if self.levelCacheDir is None:
+            return
+        key = (self.seed, level + 1, self.difficulty, self.width, self.height)
+        buildLevelFileInBackground(levelCachePath(self.levelCacheDir, *key), *key)
 
-        # Generate clouds
-        self.clouds = []
-        self.generateClouds(x=800, level=level)
+    def streamChunks(self):
+        """
+        Loads the chunks around the camera and retires the ones left behind,
+        so only a few screens of level content exist at any time.
+        """
+        first = max(0, int((self.cameraX - self.chunkWidth) // self.chunkWidth))
+        last = min(self.lastChunk,
+                   int((self.cameraX + self.width + self.chunkWidth) // self.chunkWidth))
+        wanted = range(first, last + 1)
+        if len(self.chunks) == len(wanted) and first in self.chunks and last in self.chunks:
+            return  # Already loaded
+
+        for index in list(self.chunks):
+            if index not in wanted:
+                self.retireChunk(index)
+        for index in wanted:
+            if index not in self.chunks:
+                self.loadChunk(index)
+        self.rebuildLevelLists()
+
+    def loadChunk(self, index):
+        chunk = self.levelSource.createChunk(index)
+        if index in self.collectedInChunks:
+            chunk.markCollected(self.collectedInChunks[index])
+        self.chunks[index] = chunk
+        for item in chunk.collectibles + chunk.powerUps:
+            if not item.collected:
+                self.broadPhase.insert(item)
+
+    def retireChunk(self, index):
+        chunk = self.chunks.pop(index)
+        fishOrdinals, powerUpOrdinals = chunk.collectedOrdinals()
+        if fishOrdinals or powerUpOrdinals:
+            self.collectedInChunks[index] = (fishOrdinals, powerUpOrdinals)
+        for item in chunk.collectibles + chunk.powerUps:
+            self.broadPhase.remove(item)
+
+    def rebuildLevelLists(self):
+        """
+        Rebuilds the level lists and lookup structures from the loaded chunks.
+        """
+        chunks = [self.chunks[index] for index in sorted(self.chunks)]
+        self.platforms = ([p for chunk in chunks for p in chunk.platforms] +
+                          self.movingPlatforms)
+        self.holes = [h for chunk in chunks for h in chunk.holes]
+        self.collectibles = [c for chunk in chunks for c in chunk.collectibles
+                             if not c.collected]
+        self.powerUps = [p for chunk in chunks for p in chunk.powerUps
+                         if not p.collected]
+        self.clouds = [c for chunk in chunks for c in chunk.clouds]
+
+        # Index platforms by x so sprites only test the ones beneath them
+        self.platformIndex = PlatformIndex(self.platforms)
+        # Compile the holes into solid/hole spans for ground queries
+        self.terrain = TerrainProfile(self.holes, self.groundHeight)
 
+    def reset(self, level=1, resetScore=True):
+        """
+        Resets the game state for a new level or restart.
+        """
+        self.blips = 0  # Timer for spawning enemies
+        self.groundHeight = 2 * self.height / 3  # Height of the ground
+        self.bushRadius = 50  # Not used but can be for decorations
         self.cameraX = 0  # Reset camera offset
 
+        # Broad-phase grid used for hero interactions
+        self.broadPhase = SpatialHash()
+
+        # The level only depends on (seed, level, difficulty), so restarts
+        # replay the same level; one seed per session unless one was set
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        self.levelSource = self.openLevel(level)
+        self.worldWidth = self.levelSource.worldWidth
+        self.chunkWidth = self.levelSource.chunkWidth
+        self.lastChunk = self.levelSource.lastChunk
+
+        # Level content is loaded chunk by chunk as the camera moves
+        self.chunks = {}             # Loaded chunks by index
+        self.collectedInChunks = {}  # Collected items of retired chunks
+        self.movingPlatforms = self.levelSource.createMovingPlatforms()
+        self.streamChunks()
+        self.cacheNextLevel(level)
+
         # Initialize Hero
         if not hasattr(self, 'hero'):
             self.hero = Hero(self.width / 5, self.groundHeight, images=self.selectedHeroImages)
@@ -590,8 +858,12 @@ class Game:
                 self.hero.powerUpTimers.clear()
             self.hero.images = self.selectedHeroImages  # Update hero's images
 
-        # Initialize Enemies
+        # Initialize Enemies (the old ones go back to the pool)
+        for enemy in self.enemies:
+            self.enemyPool.release(enemy)
         self.enemies = []
+        if self.enemyStore is not None:
+            self.enemyStore.clear()
 
         # Game State Flags
         self.gameOver = False
@@ -697,13 +969,18 @@ class Game:
         """
         Draws all game elements on the screen.
         """
+        if self.assetLoader is not None:
+            self.assetLoader.frameDrawn()  # Startup timing
         if self.mode == 'startScreen':
             if self.startScreenStage == 'characterSelection':
                 # Draw starting.png as background
                 if self.startScreenImage is not None:
                     drawImage(self.startScreenImage, 0, 0, width=self.width, height=self.height)
                 else:
+                    # Placeholder while starting.png loads
                     drawRect(0, 0, self.width, self.height, fill="black")
+                    drawLabel("Loading...", self.width / 2, self.height / 2,
+                              size=20, fill="white")
                 # Draw the selected character's name
                 characterName = self.availableCharacters[self.currentCharacterIndex]
                 if characterName == 'Super Cat':
@@ -748,6 +1025,10 @@ class Game:
                                  self.height - 40, fill= 'gold', lineWidth = 4)
 
         elif self.mode == 'game':
+            profiling = self.profiler.enabled
+            if profiling:
+                self.profiler.startDraw()
+
             # Draw sky background first
             drawRect(0, 0, self.width, self.height, fill="skyBlue")
 
@@ -756,22 +1037,10 @@ class Game:
                 cloud.draw(self)
 
             # Draw background based on selected character
-            if self.selectedCharacter == 'Super Cat' and self.backgroundImages.get('Super Cat'):
-                bgImage = self.backgroundImages['Super Cat']
-                
-                # Get the original width and height of the image
-                imageWidth = 801
-                imageHeight = 600
-
-                # Calculate how many times the image needs to be repeated horizontally and vertically
-                rows = math.ceil(self.height / imageHeight)
-                cols = math.ceil(self.worldWidth / imageWidth)
-
-                # Draw the image multiple times to tile it, without stretching
-                for row in range(rows):
-                    for col in range(cols):
-                        drawImage(bgImage, col * imageWidth - self.cameraX, row * imageHeight, 
-                                  width=imageWidth, height=imageHeight)
+            if self.selectedCharacter == 'Super Cat' and self.backgroundLayers.get('Super Cat'):
+                # Tile the image across the viewport, without stretching
+                for layer in self.backgroundLayers['Super Cat']:
+                    layer.draw(self.cameraX, self.width, self.height)
                  #Draw holes
                 for hole in self.holes:
                     hole.draw(self, 'blue')
@@ -782,10 +1051,14 @@ class Game:
             else:
                 # Default background if no character selected
                 drawRect(0 - self.cameraX, 0, self.worldWidth, self.height, fill="skyBlue")
+            if profiling:
+                self.profiler.lap('background')
 
             # Draw platforms
             for platform in self.platforms:
                 platform.draw(self)
+            if profiling:
+                self.profiler.lap('platforms')
 
             # Draw Collectibles
             for collectible in self.collectibles:
@@ -794,6 +1067,8 @@ class Game:
             # Draw Power-Ups
             for powerUp in self.powerUps:
                 powerUp.draw(self)
+            if profiling:
+                self.profiler.lap('pickups')
 
             # Draw Hero
             self.hero.draw(self)
@@ -801,58 +1076,19 @@ class Game:
             # Draw Enemies
             for enemy in self.enemies:
                 enemy.draw(self)
-
-            # Draw Score
-            drawLabel(f"Score: {self.hero.score}", 70, 30, size=20, fill="white")
-
-            # Display lives as hearts
-            for i in range(self.hero.lives):
-                x = 40 + i * 30
-                y = 60
-                Environment.drawHeart(x, y, 0.5, 'red') 
-
-            # Display double jump count
-            doubleJumpX = 40
-            doubleJumpY = 90
-            Environment.drawPowerIcon(doubleJumpX, doubleJumpY, 'doubleJump')
-            drawLabel(f"x{self.hero.doubleJumpCount}", doubleJumpX + 20, doubleJumpY,
-                      size=15, fill='black', bold =True)
-
-            # Draw active power-up timers
-            timerY = 30
-            for powerUpName, timeLeft in self.hero.powerUpTimers.items():
-                drawLabel(f"{powerUpName}: {timeLeft}s", self.width - 150, timerY,
-                          size=15, fill="black", align="right", bold =True)
-                timerY += 20
-
-            # Draw pause button
-            btn = self.pauseButton
-            drawRect(btn['x'], btn['y'],
-                     btn['width'], btn['height'],
-                     fill='gray', border='black')
-            # Draw '||' symbol on the pause button
-            barWidth = btn['width'] / 5
-            barHeight = btn['height'] * 0.8
-            barY = btn['y'] + (btn['height'] - barHeight) / 2
-            # Left bar
-            drawRect(btn['x'] + barWidth, barY, barWidth, barHeight, fill='white')
-            # Right bar
-            drawRect(btn['x'] + 3 * barWidth, barY, barWidth,
-                     barHeight, fill='white')
-
-            # Draw exit button
-            exitBtn = self.exitButton
-            drawRect(exitBtn['x'], exitBtn['y'],
-                     exitBtn['width'], exitBtn['height'],
-                     fill='gray', border='black')
-            # Draw 'X' symbol on the exit button
-            drawLine(exitBtn['x'] + 5, exitBtn['y'] + 5,
-                     exitBtn['x'] + exitBtn['width'] - 5,
-                     exitBtn['y'] + exitBtn['height'] - 5,
-                     fill='white', lineWidth=2)
-            drawLine(exitBtn['x'] + exitBtn['width'] - 5, exitBtn['y'] + 5,
-                     exitBtn['x'] + 5, exitBtn['y'] + exitBtn['height'] - 5,
-                     fill='white', lineWidth=2)
+            if self.enemyStore is not None:
+                images = ({WALKER: self.enemyImages.get('Walker', []),
+                           CHASER: self.enemyImages.get('Chaser', [])}
+                          if self.currentCharacterIndex == 0 else
+                          {WALKER: None, CHASER: None})
+                self.enemyStore.draw(self, images)
+            if profiling:
+                self.profiler.lap('entities')
+
+            # Draw the HUD (cached until what it shows changes)
+            self.hudLayer.draw(self)
+            if profiling:
+                self.profiler.lap('hud')
 
             if self.paused:
                 # Draw Pause Screen overlay
@@ -878,4 +1114,31 @@ class Game:
                 drawLabel("Press 'N' to Play Next Level",
                           self.width / 2, self.height / 2 + 20,
                           size=20, fill="white")
+
+            if profiling:
+                self.profiler.lap('overlays')
+                self.profiler.endFrame(self.liveEntityCounts())
+                self.drawProfilerOverlay()
+
+    def liveEntityCounts(self):
+        return {'enemies': self.enemyCount(),
+                'enemyPoolFree': self.enemyPool.freeCount(),
+                'platforms': len(self.platforms),
+                'collectibles': len(self.collectibles),
+                'powerUps': len(self.powerUps),
+                'clouds': len(self.clouds)}
+
+    def drawProfilerOverlay(self):
+        """
+        Draws the profiler's percentiles over the last frames.
+        """
+        rows = self.profiler.summary()
+        top = 120
+        drawRect(10, top, 330, 20 + 14 * len(rows), fill='black', opacity=60)
+        drawLabel(f"{'':<24}{'p50':>8}{'p95':>8}{'p99':>8}", 20, top + 10,
+                  size=11, fill='white', font='monospace', align='left')
+        for i, (column, *values) in enumerate(rows):
+            text = f"{column:<24}" + ''.join(f"{value:>8.2f}" for value in values)
+            drawLabel(text, 20, top + 24 + 14 * i,
+                      size=11, fill='white', font='monospace', align='left')
                 
\ No newline at end of file
@@ -0,0 +1,125 @@
+# graphics.py
+
+"""
+Provides the drawing and media API (drawRect, drawImage, CMUImage, Sound, ...)
+to the game modules.
+
+Normally this is simply everything exported by cmu_graphics. When the
+CAT_HEADLESS environment variable is set, or cmu_graphics is not installed,
+nothing is imported so the simulation can run without a window, audio or
+drawing (see headless.py).
+
+The draw functions go through a pluggable draw backend: CmuBackend
+forwards to cmu_graphics (the default with a window) and RecordingBackend
+records each frame as a list of commands, which also works without a
+window. drawStats['calls'] counts every shape drawn, for the frame profiler.
+"""
+
+import difflib
+import os
+
+HEADLESS = os.environ.get('CAT_HEADLESS', '') not in ('', '0')
+
+if not HEADLESS:
+    try:
+        from cmu_graphics import *
+    except ImportError:
+        # No window toolkit available; only the simulation can be used
+        HEADLESS = True
+
+# Shapes drawn since the counter was last reset
+drawStats = {'calls': 0}
+
+DRAW_FUNCTIONS = ('drawArc', 'drawCircle', 'drawImage', 'drawLabel', 'drawLine',
+                  'drawOval', 'drawPolygon', 'drawRect', 'drawRegularPolygon',
+                  'drawStar')
+
+
+class CmuBackend:
+    """
+    Draws with cmu_graphics.
+    """
+    def __init__(self, functions):
+        self.functions = functions
+
+    def draw(self, name, args, kwargs):
+        return self.functions[name](*args, **kwargs)
+
+
+class RecordingBackend:
+    """
+    Records draw calls as (function name, args, kwargs) commands instead
+    of drawing. Commands build up until endFrame, which returns them as a
+    frame and keeps the last maxFrames frames.
+    """
+    def __init__(self, maxFrames=1):
+        self.maxFrames = maxFrames
+        self.commands = []
+        self.frames = []
+
+    def draw(self, name, args, kwargs):
+        self.commands.append((name, args, kwargs))
+
+    def endFrame(self):
+        frame = self.commands
+        self.commands = []
+        self.frames.append(frame)
+        del self.frames[:-self.maxFrames]
+        return frame
+
+    def captureFrame(self, redraw):
+        """
+        Records everything drawn by redraw() as one frame.
+        """
+        self.commands = []
+        redraw()
+        return self.endFrame()
+
+
+def formatCommand(command):
+    name, args, kwargs = command
+    parts = [repr(arg) for arg in args]
+    parts += [f"{key}={value!r}" for key, value in kwargs.items()]
+    return f"{name}({', '.join(parts)})"
+
+
+def diffFrames(before, after):
+    """
+    Returns the unified diff of two recorded frames, one line per command.
+    """
+    return list(difflib.unified_diff([formatCommand(c) for c in before],
+                                     [formatCommand(c) for c in after],
+                                     'before', 'after', lineterm=''))
+
+
+if HEADLESS:
+    backend = None
+
+    def gradient(*colors, start=None):
+        # Stands in for cmu_graphics.gradient so fills can be recorded
+        return ('gradient', colors, start)
+else:
+    backend = CmuBackend({name: globals()[name] for name in DRAW_FUNCTIONS})
+
+
+def setDrawBackend(newBackend):
+    """
+    Sends all drawing to newBackend. Returns the previous backend.
+    """
+    global backend
+    previous = backend
+    backend = newBackend
+    return previous
+
+
+def backendDraw(name):
+    def draw(*args, **kwargs):
+        drawStats['calls'] += 1
+        if backend is None:
+            raise RuntimeError("No draw backend; call graphics.setDrawBackend first")
+        return backend.draw(name, args, kwargs)
+    draw.__name__ = name
+    return draw
+
+
+globals().update({name: backendDraw(name) for name in DRAW_FUNCTIONS})
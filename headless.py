@@ -0,0 +1,191 @@
+# headless.py
+
+"""
+Runs the game simulation without a window, audio or drawing.
+
+Game.reset/Game.onStep and the entity onStep methods are stepped directly,
+as fast as the CPU allows, instead of through runApp at 30 steps/sec.
+Useful for benchmarking, soak tests and batch-simulating levels:
+
+    python headless.py --level 3 --difficulty Hard --steps 20000
+
+Unless --noJump is given, the hero jumps over holes and onto dogs by
+itself (see autopilot), so a run keeps getting through the level.
+"""
+
+import os
+
+# Must be set before the game modules import graphics
+os.environ.setdefault('CAT_HEADLESS', '1')
+
+import argparse
+import copy
+import random
+import time
+from collections import deque
+from game2 import Game
+from entities2 import GRAVITY, Sprite
+
+
+def createHeadlessGame(level=1, difficulty='Hard', character='Animation Cat',
+                       width=800, height=600, seed=None, useLevelCache=True,
+                       stepsPerSecond=30):
+    """
+    Creates a Game that is already in 'game' mode on the given level.
+    No images or sounds are loaded (Game.onAppStart is never called).
+    A seed fixes both the level layout and the game's random choices.
+    stepsPerSecond sets the simulation rate.
+    """
+    if seed is not None:
+        random.seed(seed)
+    game = Game()
+    game.seed = seed
+    game.setStepRate(stepsPerSecond)
+    if not useLevelCache:
+        game.levelCacheDir = None
+    game.width = width
+    game.height = height
+    game.layoutButtons()
+    game.selectedCharacter = character
+    game.currentCharacterIndex = game.availableCharacters.index(character)
+    game.selectedHeroImages = []
+    game.difficulty = difficulty
+    game.levelNumber = level
+    game.startGame()
+    return game
+
+
+def populateEnemies(game, count):
+    """
+    Spawns count enemies spread evenly across the current screen.
+    Unlike the periodic spawner, this ignores game.maxEnemies.
+    """
+    for i in range(count):
+        game.spawnEnemy(game.cameraX + (i + 0.5) * game.width / count)
+
+
+def landing(game, jumpAfter, seconds=2):
+    """
+    Follows a copy of the hero running right that jumps after jumpAfter
+    steps. Returns the copy where it first lands after the jump, or None
+    if it falls into a hole (or is in the air when it should jump).
+    """
+    ghost = copy.copy(game.hero)
+    ghost.dx = ghost.speed
+    for i in range(int(seconds * game.stepsPerSecond)):
+        if i == jumpAfter:
+            if not ghost.onGround:
+                return None
+            ghost.dy = ghost.jumpStrength
+        Sprite.onStep(ghost, game)
+        if ghost.y - ghost.radius > game.groundHeight:
+            return None
+        if i >= jumpAfter and ghost.onGround:
+            return ghost
+    return None
+
+
+def autopilot(game, stompDistance=100):
+    """
+    Presses jump for a hero running right. Before a hole, it jumps at the
+    last step from which the jump still lands past the hole's far edge or
+    on top of a platform, trying the jump on a copy of the hero (so low
+    platforms that would cut the jump short are accounted for). It also
+    jumps when a dog is within stompDistance, to land on it.
+    """
+    hero = game.hero
+    if not hero.onGround:
+        return
+    reach = hero.radius + hero.speed * 2 * -hero.jumpStrength / GRAVITY
+    hole = min((hole for hole in game.holes
+                if hole.x + hole.width > hero.x and hole.x - hero.x < reach),
+               key=lambda hole: hole.x, default=None)
+    if hole is not None:
+        holeEnd = hole.x + hole.width
+
+        def clears(jumpAfter):
+            ghost = landing(game, jumpAfter)
+            return ghost is not None and (
+                ghost.x > holeEnd or ghost.y + ghost.radius < game.groundHeight)
+
+        if clears(0) and not clears(1):
+            game.onKeyPress('up')
+        elif not game.terrain.isOverGround(hero.x + hero.speed * game.dt):
+            game.onKeyPress('up')  # No jump clears it; jump from the edge anyway
+        return
+    if any(0 < enemy.x - hero.x < stompDistance for enemy in game.enemies):
+        game.onKeyPress('up')
+
+
+def runHeadless(game, steps, keys=('right',), restart=True, autoJump=False):
+    """
+    Advances the game by the given number of steps while holding keys.
+    If restart is True, a finished level (game over or level complete) is
+    reset so every step does real work. With autoJump, the autopilot jumps
+    for the hero; its own time is left out. Returns the steps per second
+    achieved.
+    """
+    pilotTime = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        if restart and (game.gameOver or game.levelComplete):
+            game.reset(level=game.levelNumber, resetScore=True)
+        if autoJump:
+            pilotStart = time.perf_counter()
+            autopilot(game)
+            pilotTime += time.perf_counter() - pilotStart
+        if keys:
+            game.onKeyHold(keys)
+        game.onStep()
+    elapsed = time.perf_counter() - start - pilotTime
+    return steps / elapsed if elapsed > 0 else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the game without a window.')
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--difficulty', choices=['Easy', 'Hard'], default='Hard')
+    parser.add_argument('--steps', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--rate', type=int, default=30,
+                        help='simulation steps per second of game time')
+    parser.add_argument('--enemies', type=int, default=0,
+                        help='enemies to spawn on screen before stepping')
+    parser.add_argument('--store', action='store_true',
+                        help='keep enemies in the NumPy entity store')
+    parser.add_argument('--keys', default='right',
+                        help='comma-separated keys held every step')
+    parser.add_argument('--noJump', action='store_true',
+                        help='do not jump over holes and onto dogs automatically')
+    parser.add_argument('--profile', default=None,
+                        help='write per-frame task times to this .csv/.jsonl file')
+    args = parser.parse_args()
+
+    game = createHeadlessGame(level=args.level, difficulty=args.difficulty,
+                              seed=args.seed, stepsPerSecond=args.rate)
+    if args.store and not game.enableEntityStore():
+        print("NumPy is not installed; using per-object enemies")
+    populateEnemies(game, args.enemies)
+    keys = tuple(key for key in args.keys.split(',') if key)
+    if args.profile:
+        game.profiler.frames = deque(maxlen=args.steps)
+        game.profiler.toggle()
+    stepsPerSecond = runHeadless(game, args.steps, keys=keys,
+                                 autoJump=not args.noJump)
+    print(f"Level {args.level} ({args.difficulty}): {args.steps} steps at "
+          f"{stepsPerSecond:.0f} steps/sec")
+    print(f"Score: {game.hero.score}  Lives: {game.hero.lives}  "
+          f"Enemies: {game.enemyCount()}")
+    pool = game.enemyPool.occupancy()
+    print(f"Enemy pool: {pool['active']} active, {pool['free']} free, "
+          f"{pool['created']} created, {pool['reused']} reused")
+    for phase, ms in game.scheduler.averageTimes().items():
+        print(f"  {phase:<10} {ms:8.4f} ms/step")
+    if args.profile:
+        game.profiler.flush()
+        game.profiler.dump(args.profile)
+        print(f"Wrote {len(game.profiler.frames)} profiled frames to {args.profile}")
+
+
+if __name__ == '__main__':
+    main()
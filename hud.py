@@ -0,0 +1,136 @@
+# hud.py
+
+from graphics import *
+from environment import Environment
+from sprites import SpriteAtlas, drawShapes, rasterizeShapes, translateShapes
+
+
+class CachedLayer:
+    """
+    A shape list that is only laid out again when its key changes, and is
+    drawn as one image where PIL is available. rebuilds counts how often
+    the layer was dirty.
+    """
+    def __init__(self):
+        self.key = None
+        self.shapes = []
+        self.image = None
+        self.rebuilds = 0
+
+    def draw(self, key, layout):
+        """
+        Draws the layer, first calling layout() for new shapes if key
+        differs from the last one.
+        """
+        if key != self.key:
+            self.shapes = layout()
+            if self.shapes and SpriteAtlas.available():
+                self.image = rasterizeShapes(self.shapes)
+            else:
+                self.image = None
+            self.key = key
+            self.rebuilds += 1
+        if self.image is not None:
+            image, left, top = self.image
+            drawImage(image, left, top)
+        else:
+            drawShapes(self.shapes)
+
+
+class HudLayer:
+    """
+    The in-game HUD, drawn from two cached layers that are only rebuilt
+    when what they show changes:
+    - status: score, lives, double jumps and the pause and exit buttons;
+    - timers: the power-up countdowns, which tick every second while a
+      power-up lasts, so they are kept out of the status layer.
+    """
+    def __init__(self):
+        self.status = CachedLayer()
+        self.timers = CachedLayer()
+
+    def invalidate(self):
+        self.status.key = None
+        self.timers.key = None
+
+    def statusKey(self, app):
+        hero = app.hero
+        return (hero.score, hero.lives, hero.doubleJumpCount, app.width, app.height)
+
+    def timersKey(self, app):
+        return (tuple(app.hero.powerUpTimers.items()), app.width)
+
+    def draw(self, app):
+        self.status.draw(self.statusKey(app), lambda: self.statusShapes(app))
+        self.timers.draw(self.timersKey(app), lambda: self.timerShapes(app))
+
+    def statusShapes(self, app):
+        """
+        Lays out the status layer for the current hero state.
+        """
+        hero = app.hero
+        doubleJumpX = 40
+        doubleJumpY = 90
+        shapes = self.layoutShapes(app, doubleJumpX, doubleJumpY)
+
+        # Display lives as hearts
+        heart = Environment.glyphShapes('heart', 0.5, 'red')
+        for i in range(hero.lives):
+            shapes += translateShapes(heart, 40 + i * 30, 60)
+
+        # Draw Score
+        shapes.append(('Label', (f"Score: {hero.score}", 70, 30),
+                       dict(size=20, fill="white")))
+
+        # Display double jump count
+        shapes.append(('Label', ('2x', doubleJumpX, doubleJumpY + 5),
+                       dict(size=10, fill='black')))
+        shapes.append(('Label', (f"x{hero.doubleJumpCount}", doubleJumpX + 20, doubleJumpY),
+                       dict(size=15, fill='black', bold=True)))
+        return shapes
+
+    def timerShapes(self, app):
+        """
+        Lays out the active power-up timers.
+        """
+        shapes = []
+        timerY = 30
+        for powerUpName, timeLeft in app.hero.powerUpTimers.items():
+            shapes.append(('Label', (f"{powerUpName}: {timeLeft}s", app.width - 150, timerY),
+                           dict(size=15, fill="black", align="right", bold=True)))
+            timerY += 20
+        return shapes
+
+    def layoutShapes(self, app, doubleJumpX, doubleJumpY):
+        """
+        Returns the status layer's fixed shapes: the double jump icon and
+        buttons.
+        """
+        shapes = translateShapes(Environment.glyphShapes('doubleJump', None, None),
+                                 doubleJumpX, doubleJumpY)
+
+        # Pause button with its '||' symbol
+        btn = app.pauseButton
+        shapes.append(('Rect', (btn['x'], btn['y'], btn['width'], btn['height']),
+                       dict(fill='gray', border='black')))
+        barWidth = btn['width'] / 5
+        barHeight = btn['height'] * 0.8
+        barY = btn['y'] + (btn['height'] - barHeight) / 2
+        shapes.append(('Rect', (btn['x'] + barWidth, barY, barWidth, barHeight),
+                       dict(fill='white')))
+        shapes.append(('Rect', (btn['x'] + 3 * barWidth, barY, barWidth, barHeight),
+                       dict(fill='white')))
+
+        # Exit button with its 'X' symbol
+        exitBtn = app.exitButton
+        shapes.append(('Rect', (exitBtn['x'], exitBtn['y'],
+                                exitBtn['width'], exitBtn['height']),
+                       dict(fill='gray', border='black')))
+        shapes.append(('Line', (exitBtn['x'] + 5, exitBtn['y'] + 5,
+                                exitBtn['x'] + exitBtn['width'] - 5,
+                                exitBtn['y'] + exitBtn['height'] - 5),
+                       dict(fill='white', lineWidth=2)))
+        shapes.append(('Line', (exitBtn['x'] + exitBtn['width'] - 5, exitBtn['y'] + 5,
+                                exitBtn['x'] + 5, exitBtn['y'] + exitBtn['height'] - 5),
+                       dict(fill='white', lineWidth=2)))
+        return shapes
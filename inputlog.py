@@ -0,0 +1,105 @@
+# inputlog.py
+
+"""
+Records a play session's input so it can be replayed exactly (replay.py).
+
+InputRecorder sits between the cmu_graphics event handlers and the Game.
+It forwards every event to the game and logs it per step. The session's
+random seed is logged too, and the game's state hash is stored when the log
+is saved. The log is gzipped JSON. Runs of identical frames, such as
+holding 'right', are stored once with a count.
+
+Frames are simulation steps, not drawn frames: events that arrive in a
+drawn frame that runs no step are logged with the next step.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+
+VERSION = 1
+
+
+def stateHash(game):
+    """
+    Returns a short hash of the game state that input can change.
+    """
+    state = [game.mode, game.startScreenStage, game.currentCharacterIndex,
+             game.difficulty, game.levelNumber, game.paused]
+    if hasattr(game, 'hero'):
+        hero = game.hero
+        state += [hero.x, hero.y, hero.dx, hero.dy, hero.score, hero.lives,
+                  hero.doubleJumpCount, sorted(hero.powerUpTimers.items()),
+                  game.cameraX, game.gameOver, game.levelComplete,
+                  [(type(enemy).__name__, enemy.x, enemy.y) for enemy in game.enemies],
+                  len(game.collectibles), len(game.powerUps)]
+    return hashlib.sha256(repr(state).encode()).hexdigest()[:16]
+
+
+def writeInputLog(path, log):
+    with gzip.open(path, 'wt') as f:
+        json.dump(log, f, separators=(',', ':'))
+
+
+def readInputLog(path):
+    with gzip.open(path, 'rt') as f:
+        log = json.load(f)
+    if log.get('version') != VERSION:
+        raise ValueError(f"Unsupported input log version in {path}")
+    return log
+
+
+class InputRecorder:
+    """
+    Forwards events to the game and logs them. Events are
+    ['press', key], ['hold', keys] and ['mouse', x, y]; each frame is the
+    list of events before a step.
+    """
+    def __init__(self, game, seed=None):
+        self.game = game
+        self.seed = random.getrandbits(32) if seed is None else seed
+        random.seed(self.seed)
+        game.seed = self.seed
+        self.frames = []   # [count, events] runs
+        self.events = []   # Events since the last step
+
+    def onKeyPress(self, key):
+        self.events.append(['press', key])
+        self.game.onKeyPress(key)
+
+    def onKeyHold(self, keys):
+        self.events.append(['hold', sorted(keys)])
+        self.game.onKeyHold(keys)
+
+    def onMousePress(self, x, y):
+        self.events.append(['mouse', x, y])
+        self.game.onMousePress(x, y)
+
+    def onStep(self, elapsed=None):
+        for _ in range(self.game.onStep(elapsed)):
+            if self.frames and self.frames[-1][1] == self.events:
+                self.frames[-1][0] += 1
+            else:
+                self.frames.append([1, self.events])
+            self.events = []
+
+    def steps(self):
+        return sum(count for count, _ in self.frames)
+
+    def save(self, path):
+        """
+        Writes the log with the current state hash. Events after the last
+        step are kept as pending so the hash still matches.
+        """
+        writeInputLog(path, {
+            'version': VERSION,
+            'seed': self.seed,
+            'stepsPerSecond': self.game.stepsPerSecond,
+            'width': self.game.width,
+            'height': self.game.height,
+            'frames': self.frames,
+            'pending': self.events,
+            'steps': self.steps(),
+            'stateHash': stateHash(self.game),
+        })
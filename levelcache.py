@@ -0,0 +1,239 @@
+# levelcache.py
+
+"""
+Compact on-disk cache of generated levels.
+
+A level is stored as packed int32 arrays (platforms, holes, collectibles,
+power-ups and clouds) plus, for each kind, a table saying where every chunk
+starts. Loading a level memory-maps the file; objects are only created for
+a chunk when the game loads it.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from array import array
+from chunks import LevelChunk
+from entities2 import Platform, Hole, Collectible, PowerUp, Cloud
+from levelgen import LevelGenerator
+
+MAGIC = b'CATLVL02'
+HEADER = struct.Struct('<8sdIII')  # magic, worldWidth, chunkWidth, chunk count, moving count
+POWER_TYPES = ('doubleJump', 'magnet', 'shield')
+
+# Values stored per item of each kind, in file order
+RECORD_SIZES = {'platforms': 4, 'holes': 2, 'collectibles': 2, 'powerUps': 3,
+                'clouds': 3}
+KINDS = tuple(RECORD_SIZES)
+
+# Level files kept in the cache; the least recently used go first
+MAX_CACHED_LEVELS = 64
+
+buildsInProgress = set()
+buildsLock = threading.Lock()
+
+
+def defaultCacheDir():
+    """
+    The per-user directory levels are cached in: cat-adventure/levels under
+    $XDG_CACHE_HOME, or ~/.cache if that is not set.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'),
+                                                            '.cache')
+    return os.path.join(base, 'cat-adventure', 'levels')
+
+
+def pruneLevelCache(cacheDir, maxFiles=MAX_CACHED_LEVELS):
+    """
+    Deletes the least recently used level files until at most maxFiles are
+    left. Opening a level file marks it as used.
+    """
+    try:
+        names = [name for name in os.listdir(cacheDir)
+                 if name.startswith('level-') and name.endswith('.bin')]
+    except OSError:
+        return
+    with buildsLock:
+        building = {os.path.basename(path) for path in buildsInProgress}
+    used = []
+    for name in names:
+        if name not in building:
+            try:
+                used.append((os.path.getmtime(os.path.join(cacheDir, name)), name))
+            except OSError:
+                pass  # Removed by another game
+    used.sort(reverse=True)
+    for _, name in used[maxFiles:]:
+        try:
+            os.remove(os.path.join(cacheDir, name))
+        except OSError:
+            pass  # Removed by another game, or not ours to remove
+
+
+def levelCachePath(cacheDir, seed, level, difficulty, width, height):
+    return os.path.join(cacheDir,
+                        f"level-{seed}-{level}-{difficulty}-{width}x{height}.bin")
+
+
+def itemValues(kind, item):
+    """
+    The numbers that recreate an item of the given kind (its constructor
+    arguments).
+    """
+    if kind == 'platforms':
+        return (item.startX, item.y, item.width, item.height)
+    if kind == 'holes':
+        return (item.x, item.width)
+    if kind == 'collectibles':
+        return (item.x, item.y + item.radius)
+    if kind == 'powerUps':
+        return (item.x, item.y + item.radius, POWER_TYPES.index(item.powerType))
+    return (item.x, item.y, item.size)
+
+
+def packLevel(generator):
+    """
+    Generates every chunk of a level and returns the packed level file.
+    """
+    chunkCount = generator.lastChunk + 1
+    offsets = {kind: array('I', [0]) for kind in KINDS}
+    # Stored as int32, so a cached level yields the same ints as the generator
+    values = {kind: array('i') for kind in KINDS}
+    for index in range(chunkCount):
+        chunk = generator.createChunk(index)
+        for kind in KINDS:
+            items = getattr(chunk, kind)
+            for item in items:
+                values[kind].extend(itemValues(kind, item))
+            offsets[kind].append(offsets[kind][-1] + len(items))
+
+    moving = array('i')
+    for platform in generator.createMovingPlatforms():
+        moving.extend(itemValues('platforms', platform))
+
+    parts = [HEADER.pack(MAGIC, generator.worldWidth, generator.chunkWidth,
+                         chunkCount, len(moving) // 4)]
+    parts.extend(offsets[kind].tobytes() for kind in KINDS)
+    parts.append(moving.tobytes())
+    parts.extend(values[kind].tobytes() for kind in KINDS)
+    return b''.join(parts)
+
+
+def writeLevelFile(path, seed, level, difficulty, width, height):
+    """
+    Generates a level and writes it to path. The file appears atomically,
+    so readers never see a partly written level.
+    """
+    generator = LevelGenerator(seed, level, difficulty, width, height)
+    data = packLevel(generator)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tempPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tempPath, 'wb') as f:
+        f.write(data)
+    os.replace(tempPath, path)
+
+
+def buildLevelFileInBackground(path, seed, level, difficulty, width, height):
+    """
+    Starts writing a level file on a background thread, unless it already
+    exists or is being written. The cache is pruned once the file is added.
+    """
+    with buildsLock:
+        if path in buildsInProgress or os.path.exists(path):
+            return
+        buildsInProgress.add(path)
+
+    def build():
+        try:
+            writeLevelFile(path, seed, level, difficulty, width, height)
+            pruneLevelCache(os.path.dirname(path))
+        except OSError as error:
+            print(f"Error: could not cache level {level}: {error}")
+        finally:
+            with buildsLock:
+                buildsInProgress.discard(path)
+
+    threading.Thread(target=build, daemon=True).start()
+
+
+def openLevelFile(path):
+    """
+    Memory-maps a cached level and marks it as recently used. Returns None
+    if there is no usable file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        return None  # Old format or not a level file
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # Read-only cache; pruning just sees it as older
+    return LevelData(mapped)
+
+
+class LevelData:
+    """
+    A memory-mapped level file. Offers the same createMovingPlatforms and
+    createChunk as LevelGenerator, reading the packed arrays instead of
+    generating.
+    """
+    def __init__(self, mapped):
+        self.mapped = mapped
+        (_, self.worldWidth, self.chunkWidth, chunkCount,
+         self.movingCount) = HEADER.unpack_from(mapped, 0)
+        self.lastChunk = chunkCount - 1
+
+        view = memoryview(mapped)
+        position = HEADER.size
+        self.offsets = {}
+        for kind in KINDS:
+            size = (chunkCount + 1) * 4
+            self.offsets[kind] = view[position:position + size].cast('I')
+            position += size
+
+        size = self.movingCount * 4 * 4
+        self.moving = view[position:position + size].cast('i')
+        position += size
+        self.values = {}
+        for kind in KINDS:
+            size = self.offsets[kind][-1] * RECORD_SIZES[kind] * 4
+            self.values[kind] = view[position:position + size].cast('i')
+            position += size
+
+    def createMovingPlatforms(self):
+        platforms = []
+        for i in range(0, self.movingCount * 4, 4):
+            x, y, width, height = self.moving[i:i + 4]
+            platforms.append(Platform(x, y, width, height, moving=True))
+        return platforms
+
+    def records(self, kind, index):
+        """
+        Yields the stored values of each item of a kind in a chunk.
+        """
+        size = RECORD_SIZES[kind]
+        values = self.values[kind]
+        start = self.offsets[kind][index] * size
+        end = self.offsets[kind][index + 1] * size
+        for i in range(start, end, size):
+            yield values[i:i + size]
+
+    def createChunk(self, index):
+        chunk = LevelChunk(index)
+        for x, y, width, height in self.records('platforms', index):
+            chunk.platforms.append(Platform(x, y, width, height))
+        for x, width in self.records('holes', index):
+            chunk.holes.append(Hole(x, width))
+        for x, y in self.records('collectibles', index):
+            chunk.collectibles.append(Collectible(x, y, color="orange"))
+        for x, y, powerType in self.records('powerUps', index):
+            chunk.powerUps.append(PowerUp(x, y, POWER_TYPES[int(powerType)]))
+        for x, y, size in self.records('clouds', index):
+            chunk.clouds.append(Cloud(x, y, size=size))
+        return chunk
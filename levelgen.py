@@ -0,0 +1,172 @@
+# levelgen.py
+
+"""
+Procedural level generation.
+"""
+
+import random
+import zlib
+from entities2 import Platform, Hole, Collectible, PowerUp, Cloud
+from chunks import LevelChunk
+from spatial import PlatformIndex
+
+
+def levelSeed(seed, level, difficulty):
+    """
+    Derives the seed of one level from the session seed, so each
+    (seed, level, difficulty) always produces the same level.
+    """
+    return zlib.crc32(f"{seed}:{level}:{difficulty}".encode())
+
+
+class LevelGenerator:
+    """
+    Generates a level chunk by chunk. The content depends only on the seed,
+    level, difficulty and screen size, never on global state, so a level
+    can also be built away from the game (see levelcache.py).
+    """
+    def __init__(self, seed, level, difficulty, width, height, chunkWidth=2000):
+        self.levelSeed = levelSeed(seed, level, difficulty)
+        self.difficulty = difficulty
+        self.width = width
+        self.groundHeight = 2 * height / 3  # Height of the ground
+        # Increase world width with each level
+        self.worldWidth = 4000 * (1.5 ** (level - 1))
+        self.chunkWidth = chunkWidth
+        self.lastChunk = int((self.worldWidth + width) // chunkWidth)
+        # Where each generator continues at the start of each chunk
+        self.chunkStarts = {0: {'platform': 100, 'hole': 300, 'collectible': 500,
+                                'powerUp': 700, 'cloud': 800, 'lastPlatform': None}}
+        # Moving platforms are few, so they exist for the whole level
+        self.movingPlatforms = []
+        self.generateMovingPlatforms(x=500, rng=random.Random(self.levelSeed))
+
+    def createMovingPlatforms(self):
+        return self.movingPlatforms
+
+    def generatePlatforms(self, chunk, x, endX, rng):
+        """
+        Generates platforms with varying sizes and positions from x up to
+        endX. Returns the x where the next platform will go.
+        """
+        while x < min(endX, self.worldWidth):
+            # Randomize platform attributes
+            width = rng.randint(100, 250)
+            height = 20
+            y = rng.randint(int(self.groundHeight * 0.5),
+                            int(self.groundHeight * 0.8))
+            chunk.platforms.append(Platform(x, y, width, height))
+            gap = rng.randint(75, 100)
+            x += width + gap
+        return x
+
+    def generateMovingPlatforms(self, x, rng):
+        """
+        Generates moving platforms.
+        """
+        for _ in range(5):  # Number of moving platforms
+            width = rng.randint(100, 150)
+            height = 20
+            y = rng.randint(int(self.groundHeight * 0.3),
+                            int(self.groundHeight * 0.6))
+            movingPlatform = Platform(x, y, width, height, moving=True)
+            self.movingPlatforms.append(movingPlatform)
+            x += rng.randint(500, 800)
+
+    def generateHoles(self, chunk, x, endX, rng):
+        """
+        Generates holes in the ground from x up to endX. Returns the x where
+        the next hole will go.
+        """
+        while x < min(endX, self.worldWidth):
+            width = rng.randint(80, 150)
+            chunk.holes.append(Hole(x, width))
+            x += width + rng.randint(200, 500)
+        return x
+
+    def generateCollectibles(self, chunk, x, endX, rng, platformIndex):
+        """
+        Generates collectibles on the indexed platforms from x up to endX.
+        Returns the x where the next collectible will go.
+        """
+        while x < min(endX, self.worldWidth):
+            # Find a platform near the x position
+            platform = platformIndex.platformAt(x)
+            if platform:
+                collectibleY = platform.y - 20
+            else:
+                collectibleY = rng.randint(int(self.groundHeight * 0.3),
+                                           int(self.groundHeight * 0.6))
+            chunk.collectibles.append(Collectible(x, collectibleY, color="orange"))
+            gap = rng.randint(0, 250)
+            x += gap
+        return x
+
+    def generatePowerUps(self, chunk, x, endX, rng, platformIndex):
+        """
+        Generates power-ups on the indexed platforms from x up to endX.
+        Returns the x where the next power-up will go.
+        """
+        while x < min(endX, self.worldWidth):
+            # Find a platform near the x position
+            platform = platformIndex.platformAt(x)
+            if platform:
+                powerUpY = platform.y - 30
+            else:
+                powerUpY = rng.randint(int(self.groundHeight * 0.1),
+                                       int(self.groundHeight * 0.5))
+            powerTypes = ['doubleJump', 'magnet', 'shield']
+            powerType = rng.choice(powerTypes)
+            chunk.powerUps.append(PowerUp(x, powerUpY, powerType))
+            gap = rng.randint(500, 1000)
+            x += gap
+        return x
+
+    def generateClouds(self, chunk, x, endX, rng):
+        """
+        Generates clouds in the background from x up to endX. Returns the x
+        where the next cloud will go.
+        """
+        cloudGap = 800
+        while x < min(endX, self.worldWidth + self.width):
+            y = rng.randint(50, int(self.groundHeight * 0.3))
+            size = rng.randint(60, 120)
+            chunk.clouds.append(Cloud(x, y, size=size))
+            x += cloudGap
+        return x
+
+    def createChunk(self, index):
+        """
+        Generates the content of one chunk. The result only depends on the
+        level seed and the chunk index, so a retired chunk comes back the
+        same when the camera returns to it. Chunks must first be generated
+        in order, since each one starts where the previous one stopped.
+        """
+        rng = random.Random(self.levelSeed * 1000003 + index)
+        start = self.chunkStarts[index]  # Where each generator left off
+        endX = (index + 1) * self.chunkWidth
+        chunk = LevelChunk(index)
+
+        nextStart = {}
+        nextStart['platform'] = self.generatePlatforms(chunk, start['platform'], endX, rng)
+        # Holes in the ground only in hard mode
+        if self.difficulty != 'Easy':
+            nextStart['hole'] = self.generateHoles(chunk, start['hole'], endX, rng)
+        else:
+            nextStart['hole'] = start['hole']
+        # Items are placed with a sorted lookup over this chunk's platforms,
+        # the last platform of the previous chunk (it may reach into this
+        # one) and the moving platforms
+        platforms = chunk.platforms + self.movingPlatforms
+        if start['lastPlatform'] is not None:
+            platforms.insert(0, start['lastPlatform'])
+        platformIndex = PlatformIndex(platforms)
+        nextStart['collectible'] = self.generateCollectibles(
+            chunk, start['collectible'], endX, rng, platformIndex)
+        nextStart['powerUp'] = self.generatePowerUps(
+            chunk, start['powerUp'], endX, rng, platformIndex)
+        nextStart['cloud'] = self.generateClouds(chunk, start['cloud'], endX, rng)
+        nextStart['lastPlatform'] = (chunk.platforms[-1] if chunk.platforms
+                                     else start['lastPlatform'])
+        self.chunkStarts.setdefault(index + 1, nextStart)
+        return chunk
@@ -2,10 +2,27 @@
 
 from cmu_graphics import *
 from game2 import Game
+from inputlog import InputRecorder
+import atexit
 import math
+import os
+import time
 
 # Initialize the game instance
 game = Game()
+# CAT_STEP_RATE sets the simulation rate; drawing runs at the app's rate
+game.setStepRate(int(os.environ.get('CAT_STEP_RATE', game.stepsPerSecond)))
+lastStepTime = None
+
+# CAT_RECORD=1 (or a file name) records the session for replay.py
+recordPath = os.environ.get('CAT_RECORD', '')
+if recordPath:
+    if recordPath == '1':
+        recordPath = time.strftime('session-%Y%m%d-%H%M%S.json.gz')
+    inputs = InputRecorder(game)
+    atexit.register(inputs.save, recordPath)
+else:
+    inputs = game
 
 def onAppStart(app):
     game.width = app.width
@@ -13,16 +30,21 @@ def onAppStart(app):
     game.onAppStart()
 
 def onMousePress(app, x, y):
-    game.onMousePress(x, y)
+    inputs.onMousePress(x, y)
 
 def onKeyHold(app, keys):
-    game.onKeyHold(keys)
+    inputs.onKeyHold(keys)
 
 def onKeyPress(app, key):
-    game.onKeyPress(key)
+    inputs.onKeyPress(key)
 
 def onStep(app):
-    game.onStep()
+    # Simulate the real time since the last frame in fixed steps
+    global lastStepTime
+    now = time.perf_counter()
+    elapsed = 1 / app.stepsPerSecond if lastStepTime is None else now - lastStepTime
+    lastStepTime = now
+    inputs.onStep(elapsed)
 
 def redrawAll(app):
     game.redrawAll()
@@ -0,0 +1,162 @@
+# profiler.py
+
+"""
+Frame-time profiler for Game.onStep and Game.redrawAll.
+
+While enabled, each frame records the milliseconds spent in every update
+task and draw section, the number of shapes drawn and the number of live
+entities. The last frames are kept in a ring buffer, summarized as
+percentiles by the in-game overlay (F key) and written to CSV or JSONL
+with dump. When disabled, the game only checks the enabled flag.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from graphics import drawStats
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sortedValues, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sortedValues:
+        return 0.0
+    rank = max(0, min(len(sortedValues) - 1,
+                      round(p / 100 * len(sortedValues)) - 1))
+    return sortedValues[rank]
+
+
+class FrameProfiler:
+    """
+    Records per-frame timings in a ring buffer of the last capacity frames.
+    """
+    def __init__(self, capacity=300):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity)
+        self.frameNumber = 0
+        self.current = None
+        self.lapStart = 0.0
+        self.summaryCache = None
+        self.summaryAge = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = None
+        self.summaryCache = None
+        if self.enabled:
+            self.frames.clear()
+
+    def newFrame(self):
+        self.frameNumber += 1
+        return {'frame': self.frameNumber, 'step': {}, 'draw': {},
+                'drawCalls': 0, 'entities': {}}
+
+    def stepTimes(self):
+        """
+        Starts a frame and returns the dict the scheduler fills with the
+        update tasks' milliseconds.
+        """
+        if self.current is not None:
+            self.frames.append(self.current)  # A step without a redraw
+        self.current = self.newFrame()
+        return self.current['step']
+
+    def startDraw(self):
+        if self.current is None:
+            self.current = self.newFrame()  # A redraw without a step
+        drawStats['calls'] = 0
+        self.lapStart = time.perf_counter()
+
+    def lap(self, section):
+        """
+        Records the time since the previous lap as a draw section.
+        """
+        now = time.perf_counter()
+        self.current['draw'][section] = (now - self.lapStart) * 1000
+        self.lapStart = now
+
+    def endFrame(self, entities):
+        """
+        Finishes the frame with the draw call count and entity counts.
+        """
+        self.current['drawCalls'] = drawStats['calls']
+        self.current['entities'] = entities
+        self.frames.append(self.current)
+        self.current = None
+
+    def flush(self):
+        """
+        Keeps a frame that was stepped but not drawn (headless runs).
+        """
+        if self.current is not None:
+            self.frames.append(self.current)
+            self.current = None
+
+    def series(self):
+        """
+        Returns {column: [value per frame]} over the buffered frames.
+        """
+        columns = {}
+        for frame in self.frames:
+            for kind in ('step', 'draw'):
+                for name, ms in frame[kind].items():
+                    columns.setdefault(f"{kind}.{name}", []).append(ms)
+            columns.setdefault('stepTotal', []).append(sum(frame['step'].values()))
+            columns.setdefault('drawTotal', []).append(sum(frame['draw'].values()))
+            columns.setdefault('drawCalls', []).append(frame['drawCalls'])
+            for name, count in frame['entities'].items():
+                columns.setdefault(f"entities.{name}", []).append(count)
+        return columns
+
+    def summary(self):
+        """
+        Returns [(column, p50, p95, p99)], recomputed at most every 15
+        frames so the overlay stays cheap.
+        """
+        if self.summaryCache is None or self.summaryAge >= 15:
+            self.summaryCache = []
+            for column, values in self.series().items():
+                values = sorted(values)
+                self.summaryCache.append(
+                    (column, *[percentile(values, p) for p in PERCENTILES]))
+            self.summaryAge = 0
+        self.summaryAge += 1
+        return self.summaryCache
+
+    def rows(self):
+        """
+        Returns the buffered frames as flat dicts, one per frame.
+        """
+        rows = []
+        for frame in self.frames:
+            row = {'frame': frame['frame'], 'drawCalls': frame['drawCalls']}
+            for kind in ('step', 'draw'):
+                for name, ms in frame[kind].items():
+                    row[f"{kind}.{name}"] = round(ms, 4)
+            for name, count in frame['entities'].items():
+                row[f"entities.{name}"] = count
+            rows.append(row)
+        return rows
+
+    def dump(self, path):
+        """
+        Writes the buffered frames to path: JSON lines if it ends in
+        .jsonl, CSV otherwise.
+        """
+        rows = self.rows()
+        if path.endswith('.jsonl'):
+            with open(path, 'w') as f:
+                for row in rows:
+                    f.write(json.dumps(row) + '\n')
+            return
+        columns = []
+        for row in rows:
+            columns.extend(column for column in row if column not in columns)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
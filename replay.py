@@ -0,0 +1,98 @@
+# replay.py
+
+"""
+Replays a recorded input log (see inputlog.py) without a window, as fast
+as the CPU allows, and checks the final state against the recorded hash:
+
+    python replay.py session.json.gz [--render] [--repeat 5]
+
+Exits with status 1 if the final state differs from the recording.
+"""
+
+import os
+
+# Must be set before the game modules import graphics
+os.environ.setdefault('CAT_HEADLESS', '1')
+
+import argparse
+import random
+import sys
+import time
+from game2 import Game
+from graphics import RecordingBackend, setDrawBackend
+from inputlog import readInputLog, stateHash
+
+
+# Profiler keys: they change no game state, and Shift+F writes a file
+DEBUG_KEYS = ('f', 'F')
+
+
+def applyEvents(game, events):
+    """
+    Sends recorded events to the game, leaving out the debug keys.
+    """
+    for kind, *args in events:
+        if kind == 'press' and args[0] in DEBUG_KEYS:
+            continue
+        if kind == 'press':
+            game.onKeyPress(*args)
+        elif kind == 'hold':
+            game.onKeyHold(*args)
+        elif kind == 'mouse':
+            game.onMousePress(*args)
+
+
+def replay(log, render=False):
+    """
+    Plays a log on a new Game. Returns (game, steps per second).
+    With render, every step is also drawn into a RecordingBackend.
+    """
+    random.seed(log['seed'])
+    game = Game()
+    game.seed = log['seed']
+    game.setStepRate(log['stepsPerSecond'])
+    game.width = log['width']
+    game.height = log['height']
+    game.onAppStart()
+
+    recorder = RecordingBackend()
+    previous = setDrawBackend(recorder) if render else None
+    start = time.perf_counter()
+    try:
+        for count, events in log['frames']:
+            for _ in range(count):
+                applyEvents(game, events)
+                game.onStep()
+                if render:
+                    recorder.captureFrame(game.redrawAll)
+        applyEvents(game, log['pending'])
+    finally:
+        if render:
+            setDrawBackend(previous)
+    elapsed = time.perf_counter() - start
+    return game, log['steps'] / elapsed if elapsed > 0 else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded session.')
+    parser.add_argument('log')
+    parser.add_argument('--render', action='store_true',
+                        help='also draw every step into a recording backend')
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    log = readInputLog(args.log)
+    matched = True
+    for _ in range(args.repeat):
+        game, stepsPerSecond = replay(log, render=args.render)
+        finalHash = stateHash(game)
+        matched = matched and finalHash == log['stateHash']
+        print(f"{log['steps']} steps at {stepsPerSecond:.0f} steps/sec, "
+              f"state {finalHash} "
+              f"({'matches' if finalHash == log['stateHash'] else 'expected ' + log['stateHash']})")
+    if not matched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
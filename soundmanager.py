@@ -0,0 +1,109 @@
+# soundmanager.py
+
+"""
+Sound playback for the game.
+
+Each clip is decoded once per process, however often the game returns to
+the menu. Play and pause requests made during a frame are only queued,
+and flush applies them once at the end of the frame:
+- the last request for each clip wins;
+- a clip is not restarted within minInterval seconds of its last start.
+One-shot clips take turns between a few voices, so quick repeats overlap
+instead of cutting each other off. Looping clips use a single voice that
+is paused and resumed.
+"""
+
+from graphics import *
+import time
+
+
+class SoundManager:
+    """
+    Queued, rate-limited playback of named clips. Without audio (headless
+    runs and replays) requests are accepted and dropped at flush.
+    """
+    voiceCache = {}  # (file name, voice number) -> Sound, shared by all games
+
+    def __init__(self, files, voices=3, minInterval=0.1):
+        self.files = files              # Clip name -> file name
+        self.voiceCount = voices
+        self.minInterval = minInterval  # Seconds between starts of a clip
+        self.voices = {}                # Clip name -> list of Sound
+        self.nextVoice = {}
+        self.lastStart = {}
+        self.requests = {}              # Clip name -> (action, loop)
+        self.failed = set()             # Clips that could not be loaded
+        self.played = 0
+        self.dropped = 0
+
+    def available():
+        return 'Sound' in globals()
+
+    def load(self):
+        """
+        Loads the first voice of every clip, reusing ones loaded before.
+        Extra voices are loaded when a clip first overlaps itself.
+        """
+        for name in self.files:
+            self.loadClip(name)
+
+    def loadClip(self, name):
+        """
+        Loads the first voice of one clip. Safe to run on a loader thread;
+        requests for the clip wait in the queue until it is loaded. If
+        loading fails, the error is raised and later requests are dropped.
+        """
+        if not SoundManager.available():
+            return
+        try:
+            voice = self.voice(self.files[name], 0)
+        except Exception:
+            self.failed.add(name)
+            raise
+        self.nextVoice[name] = 0
+        self.voices[name] = [voice]
+
+    def voice(self, fileName, number):
+        key = (fileName, number)
+        if key not in SoundManager.voiceCache:
+            SoundManager.voiceCache[key] = Sound(fileName)
+        return SoundManager.voiceCache[key]
+
+    def play(self, name, loop=False):
+        self.requests[name] = ('play', loop)
+
+    def pause(self, name):
+        self.requests[name] = ('pause', False)
+
+    def flush(self, now=None):
+        """
+        Applies the requests queued since the last flush.
+        """
+        if not self.requests:
+            return
+        now = time.perf_counter() if now is None else now
+        requests = self.requests
+        self.requests = {}
+        for name, (action, loop) in requests.items():
+            voices = self.voices.get(name)
+            if not voices:
+                if (SoundManager.available() and name in self.files
+                        and name not in self.failed):
+                    self.requests[name] = (action, loop)  # Still loading
+                continue
+            if action == 'pause':
+                for voice in voices:
+                    voice.pause()
+            elif loop:
+                voices[0].play(loop=True)  # Resumes where it was paused
+                self.played += 1
+            elif now - self.lastStart.get(name, float('-inf')) < self.minInterval:
+                self.dropped += 1
+            else:
+                i = self.nextVoice[name]
+                if i == len(voices):
+                    voices.append(self.voice(self.files[name], i))
+                self.nextVoice[name] = (i + 1) % self.voiceCount
+                voices[i].play(restart=True)
+                self.lastStart[name] = now
+                self.played += 1
@@ -0,0 +1,189 @@
+# spatial.py
+
+"""
+Spatial lookup structures used by the physics and collision code.
+"""
+
+import bisect
+
+
+class PlatformIndex:
+    """
+    Answers "which platforms lie under this x-span?" without scanning
+    every platform in the level.
+
+    Static platforms are kept sorted by their left edge, so a query is a
+    binary search plus a short walk. Moving platforms are few, so they are
+    kept in a small separate list that is always checked; the static part
+    never needs rebuilding while they move.
+    """
+    def __init__(self, platforms):
+        self.static = sorted((p for p in platforms if not p.moving),
+                             key=lambda p: p.x)
+        self.dynamic = [p for p in platforms if p.moving]
+        self.lefts = [p.x for p in self.static]  # Left edges, for bisect
+        # Widest static platform; bounds how far left an overlapping one can start
+        self.maxWidth = max((p.width for p in self.static), default=0)
+
+    def query(self, left, right):
+        """
+        Returns the platforms that may overlap the span [left, right],
+        static ones in x order followed by the moving ones.
+        """
+        start = bisect.bisect_left(self.lefts, left - self.maxWidth)
+        end = bisect.bisect_right(self.lefts, right, lo=start)
+        candidates = [p for p in self.static[start:end]
+                      if p.x + p.width >= left]
+        candidates.extend(self.dynamic)
+        return candidates
+
+    def platformAt(self, x):
+        """
+        Returns the first platform whose span contains x, or None. Moving
+        platforms are checked at their starting position, so the answer
+        does not depend on how far they have moved.
+        """
+        # Static platforms never overlap, so only the nearest one to the
+        # left can contain x
+        i = bisect.bisect_right(self.lefts, x) - 1
+        if i >= 0 and x <= self.static[i].x + self.static[i].width:
+            return self.static[i]
+        for platform in self.dynamic:
+            if platform.startX <= x <= platform.startX + platform.width:
+                return platform
+        return None
+
+
+class TerrainProfile:
+    """
+    Run-length description of the ground along the world: sorted spans that
+    are either solid ground at some height or a hole.
+
+    Every span carries its own ground height (None for holes), so terrain with
+    steps or slopes only needs more spans, not a different query.
+    """
+    def __init__(self, holes, groundHeight):
+        self.starts = []   # Left edge of each span
+        self.heights = []  # Ground height of each span, None for a hole
+        x = float('-inf')
+        for hole in sorted(holes, key=lambda h: h.x):
+            if hole.x > x:
+                self.addSpan(x, groundHeight)
+            self.addSpan(hole.x, None)
+            x = hole.x + hole.width
+        self.addSpan(x, groundHeight)
+
+    def addSpan(self, start, height):
+        self.starts.append(start)
+        self.heights.append(height)
+
+    def spanIndex(self, x):
+        """
+        Returns the index of the span containing x. Hole edges belong to the
+        hole, matching the inclusive checks the holes have always used.
+        """
+        i = bisect.bisect_right(self.starts, x) - 1
+        if (i > 0 and x == self.starts[i] and
+            self.heights[i] is not None and self.heights[i - 1] is None):
+            i -= 1  # x is exactly on the right edge of a hole
+        return i
+
+    def groundAt(self, x):
+        """
+        Returns the ground height under x, or None if x is over a hole.
+        """
+        return self.heights[self.spanIndex(x)]
+
+    def isOverGround(self, x):
+        return self.groundAt(x) is not None
+
+    def nextEdge(self, x, direction=1):
+        """
+        Returns the x of the next change in terrain ahead of x when moving in
+        the given direction (1 for right, -1 for left), or None if there is
+        none.
+        """
+        i = self.spanIndex(x)
+        if direction > 0:
+            i += 1
+            if i < len(self.starts) and self.starts[i] == x:
+                i += 1  # x is on a hole's right edge; that edge is behind us
+            return self.starts[i] if i < len(self.starts) else None
+        if self.starts[i] == x:
+            i -= 1  # Already on this span's left edge; look one further
+        return self.starts[i] if i > 0 else None
+
+
+class SpatialHash:
+    """
+    Uniform grid that entities register into, so the hero only has to look
+    at enemies, collectibles and power-ups in the cells around it.
+
+    Anything with x, y and radius attributes can be stored. Entities that
+    move must call move() after changing position.
+    """
+    def __init__(self, cellSize=100):
+        self.cellSize = cellSize
+        self.cells = {}        # (col, row) -> {entity: None}, kept in insertion order
+        self.entityCells = {}  # entity -> (col, row) it is stored in
+        self.maxRadius = 0     # Largest entity radius ever inserted
+
+    def cellOf(self, x, y):
+        return (int(x // self.cellSize), int(y // self.cellSize))
+
+    def insert(self, entity):
+        cell = self.cellOf(entity.x, entity.y)
+        self.cells.setdefault(cell, {})[entity] = None
+        self.entityCells[entity] = cell
+        if entity.radius > self.maxRadius:
+            self.maxRadius = entity.radius
+
+    def remove(self, entity):
+        cell = self.entityCells.pop(entity, None)
+        if cell is not None:
+            bucket = self.cells[cell]
+            del bucket[entity]
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, entity):
+        """
+        Moves a registered entity to the cell for its current position.
+        Entities that are not registered are ignored.
+        """
+        oldCell = self.entityCells.get(entity)
+        if oldCell is None:
+            return
+        cell = self.cellOf(entity.x, entity.y)
+        if cell != oldCell:
+            self.remove(entity)
+            self.insert(entity)
+
+    def clear(self):
+        self.cells.clear()
+        self.entityCells.clear()
+
+    def query(self, x, y, radius, kind=None):
+        """
+        Returns the entities (optionally only those of class kind) whose
+        circle overlaps the circle of the given radius around (x, y).
+        """
+        # Entities are bucketed by their centre, so widen the search by the
+        # largest radius an overlapping entity could have
+        reach = radius + self.maxRadius
+        minCol, minRow = self.cellOf(x - reach, y - reach)
+        maxCol, maxRow = self.cellOf(x + reach, y + reach)
+        found = []
+        for col in range(minCol, maxCol + 1):
+            for row in range(minRow, maxRow + 1):
+                bucket = self.cells.get((col, row))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    if kind is not None and not isinstance(entity, kind):
+                        continue
+                    dx = entity.x - x
+                    dy = entity.y - y
+                    if dx * dx + dy * dy <= (radius + entity.radius) ** 2:
+                        found.append(entity)
+        return found
@@ -0,0 +1,209 @@
+# sprites.py
+
+"""
+Pre-rendered images of the characters that are drawn with shapes.
+
+The vector hero and dogs describe their drawing as a list of shapes,
+(kind, args, kwargs) tuples using the same arguments as drawCircle,
+drawOval, drawRect, drawPolygon, drawArc, drawLine and drawLabel. drawShapes
+draws such a list directly; SpriteAtlas rasterizes it once with PIL so each
+frame costs a single drawImage. Environment uses the same rasterizer for its
+glyphs, and HudLayer for the HUD.
+"""
+
+from graphics import *
+import math
+
+try:
+    from PIL import Image as PILImage, ImageColor, ImageDraw, ImageFont
+except ImportError:
+    PILImage = None
+
+SUPERSAMPLE = 4      # Render larger, then shrink, to smooth the edges
+CURVE_POINTS = 64    # Points used for each circle, oval or arc
+
+# Font files tried for labels: cmu_graphics draws them in Arial, so Arial
+# where installed, then look-alikes
+FONT_FILES = {False: ('arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf',
+                      'DejaVuSans.ttf'),
+              True: ('arialbd.ttf', 'Arial Bold.ttf', 'LiberationSans-Bold.ttf',
+                     'DejaVuSans-Bold.ttf')}
+fonts = {}  # (size, bold) -> PIL font
+
+
+def drawShapes(shapes):
+    """
+    Draws a shape list with the cmu_graphics draw functions.
+    """
+    functions = {'Circle': drawCircle, 'Oval': drawOval, 'Rect': drawRect,
+                 'Polygon': drawPolygon, 'Arc': drawArc, 'Line': drawLine,
+                 'Label': drawLabel}
+    for kind, args, kwargs in shapes:
+        functions[kind](*args, **kwargs)
+
+
+def translateShapes(shapes, dx, dy):
+    """
+    Returns a copy of a shape list moved by (dx, dy).
+    """
+    moved = []
+    for kind, args, kwargs in shapes:
+        if kind in ('Polygon', 'Line'):
+            args = [value + (dy if i % 2 else dx) for i, value in enumerate(args)]
+        elif kind == 'Label':
+            args = (args[0], args[1] + dx, args[2] + dy) + tuple(args[3:])
+        else:
+            args = (args[0] + dx, args[1] + dy) + tuple(args[2:])
+        moved.append((kind, args, kwargs))
+    return moved
+
+
+def ovalPoints(cx, cy, width, height, rotateAngle=0):
+    angle = math.radians(rotateAngle)
+    cos, sin = math.cos(angle), math.sin(angle)
+    points = []
+    for i in range(CURVE_POINTS):
+        theta = 2 * math.pi * i / CURVE_POINTS
+        dx = width / 2 * math.cos(theta)
+        dy = height / 2 * math.sin(theta)
+        # Positive angles turn clockwise on screen, as in cmu_graphics
+        points.append((cx + dx * cos - dy * sin, cy + dx * sin + dy * cos))
+    return points
+
+
+def labelFont(size, bold=False):
+    """
+    The PIL font used for labels of the given pixel size.
+    """
+    key = (size, bold)
+    if key not in fonts:
+        font = None
+        for fileName in FONT_FILES[bold]:
+            try:
+                font = ImageFont.truetype(fileName, size)
+                break
+            except OSError:
+                continue
+        fonts[key] = font or ImageFont.load_default(size)
+    return fonts[key]
+
+
+def labelLayout(args, kwargs, scale=1):
+    """
+    Places a label the way cmu_graphics does: the box around the text's
+    ink above the baseline is centered on (x, y), or has its left or right
+    edge there with align='left' or 'right'. Returns (font, x, baseline y,
+    ink box) with the font scaled up by scale.
+    """
+    value, x, y = args[:3]
+    font = labelFont(int(kwargs.get('size', 12) * scale + 0.5),
+                     kwargs.get('bold', False))
+    left, top, right, bottom = (value / scale for value in
+                                font.getbbox(str(value), anchor='ls'))
+    width, height = right - left, -top
+    align = kwargs.get('align', 'center')
+    centerX = x - width / 2 if align == 'right' else x + width / 2 if align == 'left' else x
+    originX = centerX - width / 2 - left
+    baseline = y + height / 2
+    return font, originX, baseline, (originX + left, baseline + top,
+                                     originX + right, baseline + bottom)
+
+
+def shapeOutline(kind, args, kwargs):
+    """
+    Returns the outline of a shape as a list of points.
+    """
+    if kind == 'Circle':
+        cx, cy, radius = args
+        return ovalPoints(cx, cy, radius * 2, radius * 2)
+    if kind == 'Oval':
+        cx, cy, width, height = args
+        return ovalPoints(cx, cy, width, height, kwargs.get('rotateAngle', 0))
+    if kind == 'Rect':
+        left, top, width, height = args
+        return [(left, top), (left + width, top),
+                (left + width, top + height), (left, top + height)]
+    if kind == 'Arc':
+        # A pie slice; as in cmu_graphics, angles go clockwise from 12 o'clock
+        cx, cy, width, height, startAngle, sweepAngle = args
+        points = [(cx, cy)]
+        for i in range(CURVE_POINTS):
+            theta = (math.radians(90 - startAngle)
+                     - math.radians(sweepAngle) * i / (CURVE_POINTS - 1))
+            points.append((cx + width / 2 * math.cos(theta),
+                           cy - height / 2 * math.sin(theta)))
+        return points
+    if kind == 'Label':
+        *_, (left, top, right, bottom) = labelLayout(args, kwargs)
+        return [(left, top), (right, top), (right, bottom), (left, bottom)]
+    return list(zip(args[::2], args[1::2]))  # Polygon and Line
+
+
+def pixels(lineWidth):
+    """
+    A line width in supersampled pixels. (cmu_graphics' round always
+    raises, and it comes in with the graphics import.)
+    """
+    return int(lineWidth * SUPERSAMPLE + 0.5)
+
+
+def rasterizeShapes(shapes):
+    """
+    Renders a shape list into an image. Returns (CMUImage, left, top),
+    where left and top place the image relative to the shapes' origin.
+    """
+    outlines = [shapeOutline(kind, args, kwargs) for kind, args, kwargs in shapes]
+    margin = 1 + max(max(kwargs.get('borderWidth', 2), kwargs.get('lineWidth', 2))
+                     for _, _, kwargs in shapes) / 2
+    left = math.floor(min(x for points in outlines for x, _ in points) - margin)
+    top = math.floor(min(y for points in outlines for _, y in points) - margin)
+    right = math.ceil(max(x for points in outlines for x, _ in points) + margin)
+    bottom = math.ceil(max(y for points in outlines for _, y in points) + margin)
+    width, height = right - left, bottom - top
+
+    image = PILImage.new('RGBA', (width * SUPERSAMPLE, height * SUPERSAMPLE))
+    canvas = ImageDraw.Draw(image)
+    for (kind, args, kwargs), points in zip(shapes, outlines):
+        points = [((x - left) * SUPERSAMPLE, (y - top) * SUPERSAMPLE)
+                  for x, y in points]
+        fill = kwargs.get('fill', 'black')
+        if kind == 'Label':
+            font, x, baseline, _ = labelLayout(args, kwargs, SUPERSAMPLE)
+            canvas.text(((x - left) * SUPERSAMPLE, (baseline - top) * SUPERSAMPLE),
+                        str(args[0]), font=font, fill=ImageColor.getrgb(fill),
+                        anchor='ls')
+            continue
+        if kind == 'Line':
+            canvas.line(points, fill=ImageColor.getrgb(fill),
+                        width=pixels(kwargs.get('lineWidth', 2)))
+            continue
+        if fill is not None:
+            canvas.polygon(points, fill=ImageColor.getrgb(fill))
+        if kwargs.get('border') is not None:
+            canvas.line(points + points[:1], fill=ImageColor.getrgb(kwargs['border']),
+                        width=pixels(kwargs.get('borderWidth', 2)),
+                        joint='curve')
+    image = image.resize((width, height), PILImage.LANCZOS)
+    return CMUImage(image), left, top
+
+
+class SpriteAtlas:
+    """
+    Named, pre-rendered sprite frames. Each frame is drawn with a single
+    drawImage at the position its shapes were described relative to.
+    """
+    def __init__(self):
+        self.frames = {}
+
+    def available():
+        return PILImage is not None and 'CMUImage' in globals()
+
+    def add(self, name, shapes):
+        """
+        Renders the shapes, described around (0, 0), as frame name.
+        """
+        self.frames[name] = rasterizeShapes(shapes)
+
+    def draw(self, name, x, y):
+        image, left, top = self.frames[name]
+        drawImage(image, x + left, y + top)
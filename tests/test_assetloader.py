@@ -0,0 +1,28 @@
+# test_assetloader.py
+
+"""
+The background asset loader and its startup timings.
+"""
+
+import threading
+import time
+
+from assetloader import AssetLoader
+
+
+def test_timingsWaitForEveryRequest():
+    loader = AssetLoader()
+    release = threading.Event()
+    loader.request('fast', lambda: 1)
+    loader.request('slow', release.wait)
+    loader.frameDrawn()
+    time.sleep(0.05)
+    firstFrame, allAssets = loader.timings()
+    assert firstFrame is not None
+    assert allAssets is None
+    release.set()
+    deadline = time.perf_counter() + 5
+    while loader.timings()[1] is None and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert loader.timings()[1] is not None
+    assert loader.take() == {'fast': 1, 'slow': True}
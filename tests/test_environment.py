@@ -0,0 +1,58 @@
+# test_environment.py
+
+"""
+Cached glyphs must look like the shapes cmu_graphics would draw directly.
+"""
+
+import pytest
+
+PILImage = pytest.importorskip('PIL.Image')
+ImageDraw = pytest.importorskip('PIL.ImageDraw')
+ImageFilter = pytest.importorskip('PIL.ImageFilter')
+cmuUtils = pytest.importorskip('cmu_graphics.utils')
+
+import graphics
+from environment import Environment
+from graphics import RecordingBackend, setDrawBackend
+
+pytestmark = pytest.mark.skipif(graphics.HEADLESS, reason='needs cmu_graphics')
+
+
+def drawnGlyph(shape):
+    """
+    Draws a glyph at (0, 0) and returns (PIL image, left, top) of the
+    drawImage call it made.
+    """
+    recorder = RecordingBackend()
+    previous = setDrawBackend(recorder)
+    try:
+        Environment.drawGlyph(shape, None, None, 0, 0)
+    finally:
+        setDrawBackend(previous)
+    [(name, (image, left, top), kwargs)] = recorder.commands
+    assert name == 'drawImage'
+    return image.image.convert('RGBA'), left, top
+
+
+def test_doubleJumpGlyphMatchesDirectArcs():
+    image, left, top = drawnGlyph('doubleJump')
+    # The wing arcs as cmu_graphics would draw them
+    direct = PILImage.new('L', image.size)
+    canvas = ImageDraw.Draw(direct)
+    for kind, args, kwargs in Environment.glyphShapes('doubleJump', None, None):
+        assert kind == 'Arc'
+        points = cmuUtils.getArcPoints(*args)
+        canvas.polygon([(x - left, y - top) for x, y in points], fill=255)
+
+    # Away from the outline (antialiasing and the border), the glyph must
+    # be opaque inside the arcs and transparent outside them
+    alpha = image.getchannel('A')
+    inside = direct.filter(ImageFilter.MinFilter(5))
+    outside = direct.filter(ImageFilter.MaxFilter(5))
+    width, height = image.size
+    for x in range(width):
+        for y in range(height):
+            if inside.getpixel((x, y)):
+                assert alpha.getpixel((x, y)) > 127, (x + left, y + top)
+            elif not outside.getpixel((x, y)):
+                assert alpha.getpixel((x, y)) <= 127, (x + left, y + top)
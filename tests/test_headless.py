@@ -0,0 +1,23 @@
+# test_headless.py
+
+"""
+The headless runner and its autopilot.
+"""
+
+import pytest
+
+from headless import createHeadlessGame, runHeadless
+
+
+@pytest.mark.parametrize('seed', [1, 5, 13])
+def test_autopilotClearsFirstHardHole(seed):
+    game = createHeadlessGame(difficulty='Hard', seed=seed, useLevelCache=False)
+    firstHole = min(game.holes, key=lambda hole: hole.x)
+    holeEnd = firstHole.x + firstHole.width
+    lives = game.hero.lives
+    for _ in range(10 * game.stepsPerSecond):
+        runHeadless(game, 1, autoJump=True, restart=False)
+        if game.hero.x > holeEnd + game.hero.radius:
+            break
+    assert game.hero.x > holeEnd + game.hero.radius
+    assert game.hero.lives == lives
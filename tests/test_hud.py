@@ -0,0 +1,29 @@
+# test_hud.py
+
+"""
+The cached HUD layers.
+"""
+
+import graphics
+from graphics import RecordingBackend
+from headless import createHeadlessGame
+
+
+def test_timersDoNotRebuildStatus():
+    game = createHeadlessGame(seed=1, useLevelCache=False)
+    recorder = RecordingBackend()
+    previous = graphics.setDrawBackend(recorder)
+    try:
+        for timeLeft in (3, 3, 2, 2, 1):
+            game.hero.powerUpTimers['Magnet'] = timeLeft
+            recorder.captureFrame(lambda: game.hudLayer.draw(game))
+    finally:
+        graphics.setDrawBackend(previous)
+    hud = game.hudLayer
+    assert hud.timers.rebuilds == 3
+    assert hud.status.rebuilds == 1
+    # Hearts and labels are part of the cached layers, not drawn per frame
+    labels = [args[0] for name, args, kwargs in hud.status.shapes + hud.timers.shapes
+              if name == 'Label']
+    assert 'Score: 0' in labels
+    assert 'Magnet: 1s' in labels
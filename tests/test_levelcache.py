@@ -0,0 +1,21 @@
+# test_levelcache.py
+
+"""
+The on-disk level cache.
+"""
+
+import os
+
+from levelcache import levelCachePath, openLevelFile, pruneLevelCache, writeLevelFile
+
+
+def test_pruneKeepsRecentlyOpenedLevels(tmp_path):
+    paths = []
+    for level in (1, 2, 3):
+        path = levelCachePath(str(tmp_path), 7, level, 'Hard', 800, 600)
+        writeLevelFile(path, 7, level, 'Hard', 800, 600)
+        os.utime(path, (level, level))
+        paths.append(path)
+    assert openLevelFile(paths[0]) is not None  # Level 1 is now the newest
+    pruneLevelCache(str(tmp_path), maxFiles=2)
+    assert [os.path.exists(path) for path in paths] == [True, False, True]
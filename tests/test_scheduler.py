@@ -0,0 +1,30 @@
+# test_scheduler.py
+
+"""
+The fixed-timestep clock.
+"""
+
+import pytest
+
+from scheduler import FixedTimestep
+
+
+def test_carriesLeftoverTime():
+    clock = FixedTimestep()
+    dt = 1 / 30
+    assert clock.advance(1.5 * dt, dt) == 1
+    assert clock.advance(0.6 * dt, dt) == 1
+    assert clock.accumulator == pytest.approx(0.1 * dt)
+
+
+def test_catchUpIsCappedButKeepsOneStep():
+    clock = FixedTimestep(maxSteps=5)
+    dt = 1 / 30
+    assert clock.advance(20 * dt, dt) == 5
+    # Only one step of the time beyond the cap is kept
+    assert clock.accumulator == pytest.approx(dt)
+    assert clock.advance(0.5 * dt, dt) == 1
+    assert clock.accumulator == pytest.approx(0.5 * dt)
+    # Less than a step beyond the cap is kept whole
+    assert clock.advance(5.3 * dt, dt) == 5
+    assert clock.accumulator == pytest.approx(0.8 * dt)
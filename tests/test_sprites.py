@@ -0,0 +1,36 @@
+# test_sprites.py
+
+"""
+The pre-rendered sprites must match what cmu_graphics draws directly.
+These tests import the game modules the way the windowed game does.
+"""
+
+import math
+import pytest
+
+pytest.importorskip('PIL')
+cmuUtils = pytest.importorskip('cmu_graphics.utils')
+
+import graphics
+from sprites import CURVE_POINTS, rasterizeShapes, shapeOutline
+
+pytestmark = pytest.mark.skipif(graphics.HEADLESS, reason='needs cmu_graphics')
+
+
+def test_rasterizeShapesThroughGraphicsImport():
+    shapes = [('Circle', (0, 0, 10), dict(fill='red', border='black', borderWidth=3)),
+              ('Line', (-10, 0, 10, 0), dict(fill='blue', lineWidth=1.5))]
+    image, left, top = rasterizeShapes(shapes)
+    assert (left, top) == (-13, -13)
+    assert image.image.size == (26, 26)
+
+
+def test_arcOutlineMatchesCmuGraphics():
+    # A lopsided arc (start 30, sweep 110) tells the angle conventions apart
+    args = (200, 140, 60, 40, 30, 110)
+    # sizeForN chosen so cmu_graphics uses CURVE_POINTS points as well
+    expected = cmuUtils.getArcPoints(*args, sizeForN=50 * (CURVE_POINTS - 6) / 18)
+    points = shapeOutline('Arc', args, {})
+    assert len(points) == len(expected)
+    for (x, y), (cmuX, cmuY) in zip(points, expected):
+        assert x == pytest.approx(cmuX) and y == pytest.approx(cmuY)